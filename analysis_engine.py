@@ -5,24 +5,35 @@
 - 카테고리: 관객, 예산, 프로그램, 홍보, 작품, 유사전시
 """
 
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
 from typing import Optional
 
 from reference_data import (
-    compute_stats,
     compute_percentile,
     compute_rank,
     compute_derived_metrics,
     get_similar_exhibitions,
-    exclude_type_zero,
+    get_similarity_index,
     filter_by_type,
     get_type_label,
     get_type_count,
     format_number,
     format_percent,
+    get_stats_index,
+    get_reference_version,
+    get_type_partition,
+    get_period_index,
+    ALL_TIME_LABEL,
+    PERIOD_WINDOWS,
     FieldStats,
+    ReferenceStatsIndex,
 )
 
 
@@ -60,6 +71,7 @@ class AnalysisResult:
     insights: list[Insight] = field(default_factory=list)
     similar_exhibitions: list[SimilarExhibitionRow] = field(default_factory=list)
     similar_comparison_table: Optional[pd.DataFrame] = None
+    period_comparison_table: Optional[pd.DataFrame] = None  # 기간별(역대·최근 N년) 비교표
 
 
 # ──────────────────────────────────────────────
@@ -220,8 +232,8 @@ def _make_ratio_insight(
     )
 
     # 백분위 계산
-    sorted_vals = sorted(valid.tolist())
-    below = sum(1 for v in sorted_vals if v < current_ratio)
+    sorted_vals = np.sort(valid.to_numpy(dtype=float))
+    below = int(np.searchsorted(sorted_vals, current_ratio, side="left"))
     pct = int(below / len(sorted_vals) * 100)
 
     return Insight(
@@ -240,7 +252,9 @@ def _make_ratio_insight(
 # 카테고리별 분석 함수
 # ──────────────────────────────────────────────
 
-def _analyze_visitors(current: dict, df: pd.DataFrame, group_label: str = "역대") -> list[Insight]:
+def _analyze_visitors(
+    current: dict, df: pd.DataFrame, index: ReferenceStatsIndex, group_label: str = "역대"
+) -> list[Insight]:
     """관객 분석 인사이트"""
     insights = []
 
@@ -249,7 +263,7 @@ def _analyze_visitors(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "관객", "총 관객수", "총 관객수", val,
-            compute_stats(df, "총 관객수"), unit="명", priority=1,
+            index.get("총 관객수"), unit="명", priority=1,
             group_label=group_label
         )
         if ins:
@@ -260,7 +274,7 @@ def _analyze_visitors(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "관객", "일평균 관객수", "일평균 관객수", val,
-            compute_stats(df, "일평균 관객수"), unit="명", priority=2,
+            index.get("일평균 관객수"), unit="명", priority=2,
             group_label=group_label
         )
         if ins:
@@ -292,7 +306,7 @@ def _analyze_visitors(current: dict, df: pd.DataFrame, group_label: str = "역
     if val and val > 0:
         ins = _make_basic_insight(
             "관객", "오프닝 참석", "오프닝 참석 인원", val,
-            compute_stats(df, "오프닝 참석 인원"), unit="명", priority=3,
+            index.get("오프닝 참석 인원"), unit="명", priority=3,
             group_label=group_label
         )
         if ins:
@@ -301,7 +315,9 @@ def _analyze_visitors(current: dict, df: pd.DataFrame, group_label: str = "역
     return insights
 
 
-def _analyze_budget(current: dict, df: pd.DataFrame, group_label: str = "역대") -> list[Insight]:
+def _analyze_budget(
+    current: dict, df: pd.DataFrame, index: ReferenceStatsIndex, group_label: str = "역대"
+) -> list[Insight]:
     """예산 효율 분석 인사이트"""
     insights = []
 
@@ -310,7 +326,7 @@ def _analyze_budget(current: dict, df: pd.DataFrame, group_label: str = "역대"
     if val:
         ins = _make_basic_insight(
             "예산", "총 사용 예산", "총 사용 예산", val,
-            compute_stats(df, "총 사용 예산"), unit="원", priority=2,
+            index.get("총 사용 예산"), unit="원", priority=2,
             group_label=group_label
         )
         if ins:
@@ -351,7 +367,9 @@ def _analyze_budget(current: dict, df: pd.DataFrame, group_label: str = "역대"
     return insights
 
 
-def _analyze_programs(current: dict, df: pd.DataFrame, group_label: str = "역대") -> list[Insight]:
+def _analyze_programs(
+    current: dict, df: pd.DataFrame, index: ReferenceStatsIndex, group_label: str = "역대"
+) -> list[Insight]:
     """프로그램 밀도 분석 인사이트"""
     insights = []
 
@@ -360,7 +378,7 @@ def _analyze_programs(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "프로그램", "프로그램 수", "프로그램 수", val,
-            compute_stats(df, "프로그램 총 수"), unit="개", priority=2,
+            index.get("프로그램 총 수"), unit="개", priority=2,
             group_label=group_label
         )
         if ins:
@@ -371,7 +389,7 @@ def _analyze_programs(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "프로그램", "프로그램 참여 인원", "프로그램 참여 인원", val,
-            compute_stats(df, "프로그램 참여 인원"), unit="명", priority=2,
+            index.get("프로그램 참여 인원"), unit="명", priority=2,
             group_label=group_label
         )
         if ins:
@@ -402,7 +420,7 @@ def _analyze_programs(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "프로그램", "도슨트 참여", "도슨트 참여 인원", val,
-            compute_stats(df, "도슨트 참여 인원"), unit="명", priority=3,
+            index.get("도슨트 참여 인원"), unit="명", priority=3,
             group_label=group_label
         )
         if ins:
@@ -411,7 +429,9 @@ def _analyze_programs(current: dict, df: pd.DataFrame, group_label: str = "역
     return insights
 
 
-def _analyze_promotion(current: dict, df: pd.DataFrame, group_label: str = "역대") -> list[Insight]:
+def _analyze_promotion(
+    current: dict, df: pd.DataFrame, index: ReferenceStatsIndex, group_label: str = "역대"
+) -> list[Insight]:
     """홍보 효과 분석 인사이트"""
     insights = []
 
@@ -420,7 +440,7 @@ def _analyze_promotion(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "홍보", "언론 보도", "언론 보도 건수", val,
-            compute_stats(df, "언론 보도 건수"), unit="건", priority=2,
+            index.get("언론 보도 건수"), unit="건", priority=2,
             group_label=group_label
         )
         if ins:
@@ -444,7 +464,7 @@ def _analyze_promotion(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "홍보", "SNS 활동", "SNS 게시 건수", val,
-            compute_stats(df, "SNS 게시 건수"), unit="건", priority=3,
+            index.get("SNS 게시 건수"), unit="건", priority=3,
             group_label=group_label
         )
         if ins:
@@ -453,7 +473,7 @@ def _analyze_promotion(current: dict, df: pd.DataFrame, group_label: str = "역
     # 뉴스레터 오픈율
     val = current.get("뉴스레터 오픈율")
     if val:
-        stats = compute_stats(df, "뉴스레터 오픈율")
+        stats = index.get("뉴스레터 오픈율")
         if stats and stats.count >= 3:
             avg = stats.mean
             diff = (val - avg) * 100  # percentage points
@@ -476,7 +496,9 @@ def _analyze_promotion(current: dict, df: pd.DataFrame, group_label: str = "역
     return insights
 
 
-def _analyze_artworks(current: dict, df: pd.DataFrame, group_label: str = "역대") -> list[Insight]:
+def _analyze_artworks(
+    current: dict, df: pd.DataFrame, index: ReferenceStatsIndex, group_label: str = "역대"
+) -> list[Insight]:
     """작품 규모 분석 인사이트"""
     insights = []
 
@@ -484,7 +506,7 @@ def _analyze_artworks(current: dict, df: pd.DataFrame, group_label: str = "역
     if val:
         ins = _make_basic_insight(
             "작품", "출품 작품 수", "출품 작품 수", val,
-            compute_stats(df, "출품 작품 수_총"), unit="점", priority=2,
+            index.get("출품 작품 수_총"), unit="점", priority=2,
             group_label=group_label
         )
         if ins:
@@ -507,10 +529,13 @@ COMPARISON_FIELDS = [
 
 
 def _build_similar_comparison(
-    current: dict, df: pd.DataFrame, top_n: int = 5
+    current: dict, df: pd.DataFrame, top_n: int = 5, cache_key=None
 ) -> tuple[list[SimilarExhibitionRow], Optional[pd.DataFrame]]:
     """유사 전시 비교 데이터 구축"""
-    similar_df = get_similar_exhibitions(df, current, top_n=top_n)
+    similar_df = get_similar_exhibitions(
+        df, current, top_n=top_n,
+        index=get_similarity_index(df, cache_key=cache_key) if not df.empty else None,
+    )
     if similar_df.empty:
         return [], None
 
@@ -585,12 +610,107 @@ def _generate_similar_insight(
     return None
 
 
+# ──────────────────────────────────────────────
+# 기간별 비교 (역대 vs 최근 N년)
+# ──────────────────────────────────────────────
+
+PERIOD_COMPARISON_FIELDS = COMPARISON_FIELDS + [("관객당_비용", "원")]
+PERIOD_MIN_COUNT = 3  # 기간 안의 유효 전시가 이보다 적으면 비교하지 않음
+PERIOD_INSIGHT_GAP = 15  # 기간별 백분위 차이가 이 이상이면 인사이트 생성
+
+
+def _build_period_comparison(
+    current: dict, ref_df: pd.DataFrame, exhibition_type, label_prefix: str = ""
+) -> tuple[dict, Optional[pd.DataFrame]]:
+    """
+    여러 기간(PERIOD_WINDOWS)과의 비교를 연도별 누적 집계에서 한 번에 계산합니다.
+
+    Returns:
+        ({필드: {기간 라벨: (PeriodStats, 백분위)}}, 비교표 DataFrame 또는 None)
+    """
+    index = get_period_index(ref_df)
+    if index.latest_year is None:
+        return {}, None
+    windows = {
+        (f"최근 {n}년({index.window_start(n)}~)" if n else label): n
+        for label, n in PERIOD_WINDOWS.items()
+    }
+
+    values = dict(current)
+    budget, visitors = current.get("총 사용 예산"), current.get("총 관객수")
+    if budget and visitors and visitors > 0:
+        values["관객당_비용"] = budget / visitors
+
+    fields = [(f, unit) for f, unit in PERIOD_COMPARISON_FIELDS if values.get(f)]
+    comparison = index.compare(values, [f for f, _ in fields], exhibition_type, windows)
+
+    table_data = {"지표": [], "이번 전시": []}
+    for label in windows:
+        table_data[f"{label_prefix}{label} 평균"] = []
+        table_data[f"{label_prefix}{label} 백분위"] = []
+    for f, unit in fields:
+        by_window = comparison[f]
+        if not any(st and st.count >= PERIOD_MIN_COUNT for st, _ in by_window.values()):
+            continue
+        table_data["지표"].append(f.replace("_", " "))
+        table_data["이번 전시"].append(format_number(values[f], unit))
+        for label, (st, pct) in by_window.items():
+            ok = st is not None and st.count >= PERIOD_MIN_COUNT
+            table_data[f"{label_prefix}{label} 평균"].append(
+                f"{format_number(st.mean, unit)} ({st.count}건)" if ok else "—"
+            )
+            table_data[f"{label_prefix}{label} 백분위"].append(
+                f"P{pct}" if ok and pct is not None else "—"
+            )
+    if not table_data["지표"]:
+        return comparison, None
+    return comparison, pd.DataFrame(table_data)
+
+
+def _generate_period_insight(comparison: dict, group_label: str) -> Optional[Insight]:
+    """총 관객수의 역대 백분위와 최근 기간 백분위가 크게 다르면 추세 인사이트 생성"""
+    by_window = comparison.get("총 관객수")
+    if not by_window or ALL_TIME_LABEL not in by_window:
+        return None
+    all_stats, all_pct = by_window[ALL_TIME_LABEL]
+    if all_stats is None or all_pct is None:
+        return None
+
+    for label, (st, pct) in by_window.items():
+        if label == ALL_TIME_LABEL or st is None or pct is None:
+            continue
+        if st.count < PERIOD_MIN_COUNT or st.count >= all_stats.count:
+            continue
+        gap = pct - all_pct
+        if abs(gap) < PERIOD_INSIGHT_GAP:
+            continue
+        trend = "높아" if st.mean > all_stats.mean else "낮아"
+        text = (
+            f"총 관객수는 {group_label} 기준 백분위 {all_pct}이지만 "
+            f"{label} 전시 {st.count}개 기준으로는 백분위 {pct}입니다. "
+            f"최근 전시의 평균 관객수({format_number(st.mean, '명')})가 "
+            f"{group_label} 평균({format_number(all_stats.mean, '명')})보다 {trend}진 영향으로, "
+            f"최근 전시들과 비교하면 상대적으로 {'더 높은' if gap > 0 else '더 낮은'} 위치입니다."
+        )
+        return Insight(
+            category="관객",
+            title="기간별 관객 비교",
+            text=text,
+            metric_name="총 관객수",
+            reference_avg=st.mean,
+            percentile=pct,
+            total_count=st.count,
+            priority=3,
+        )
+    return None
+
+
 # ──────────────────────────────────────────────
 # 교차 인사이트 (지표 간 관계 서사)
 # ──────────────────────────────────────────────
 
 def _analyze_cross_metrics(
-    current: dict, df: pd.DataFrame, group_label: str = "역대"
+    current: dict, df: pd.DataFrame, index: ReferenceStatsIndex, group_label: str = "역대"
 ) -> list[Insight]:
     """
     여러 지표를 교차 분석하여 관계성 서사 인사이트를 생성합니다.
@@ -607,8 +727,8 @@ def _analyze_cross_metrics(
     participants = current.get("프로그램 참여 인원")
 
     # 필요한 통계
-    budget_stats = compute_stats(df, "총 사용 예산")
-    visitor_stats = compute_stats(df, "총 관객수")
+    budget_stats = index.get("총 사용 예산")
+    visitor_stats = index.get("총 관객수")
 
     def _diff_pct(val, stats):
         if val is None or stats is None or stats.mean == 0:
@@ -621,7 +741,7 @@ def _analyze_cross_metrics(
     # ── 1. 예산 vs 관객 효율 ──
     if budget is not None and visitors is not None and budget_diff is not None and visitor_diff is not None:
         cost_per_visitor = budget / visitors if visitors > 0 else None
-        cost_stats = compute_stats(df, "관객당_비용") if "관객당_비용" in df.columns else None
+        cost_stats = index.get("관객당_비용")
 
         if cost_per_visitor and cost_stats and cost_stats.count >= 3:
             cost_diff = _diff_pct(cost_per_visitor, cost_stats)
@@ -661,7 +781,7 @@ def _analyze_cross_metrics(
 
     # ── 2. 홍보(보도) vs 관객 유입 ──
     if press and visitors and press > 0 and visitor_stats and visitor_stats.count >= 3:
-        press_stats = compute_stats(df, "언론 보도 건수")
+        press_stats = index.get("언론 보도 건수")
         press_diff = _diff_pct(press, press_stats)
 
         if press_diff is not None and visitor_diff is not None:
@@ -775,11 +895,16 @@ def generate_all_insights(
     Returns:
         AnalysisResult: 인사이트 목록 + 유사 전시 비교 데이터
     """
-    # 유형 0 제외 후 파생 지표 계산
-    df_full = compute_derived_metrics(exclude_type_zero(ref_df))
+    # 유형 0 제외·유형별 분할은 레퍼런스 버전당 한 번만 계산
+    # (파생 지표는 load_reference가 이미 계산해 두었으면 그대로 사용)
+    partition = get_type_partition(ref_df)
+    df_full = compute_derived_metrics(partition.all)
 
     # 유형별 필터링 (같은 유형이 3개 미만이면 전체 사용)
-    df_typed = filter_by_type(df_full, exhibition_type)
+    if df_full is partition.all:
+        df_typed = partition.filter(exhibition_type)
+    else:
+        df_typed = filter_by_type(df_full, exhibition_type)
     is_type_filtered = len(df_typed) < len(df_full)
 
     if is_type_filtered:
@@ -788,23 +913,40 @@ def generate_all_insights(
     else:
         group_label = "역대"
 
+    # 필드별 통계는 (레퍼런스 버전, 유형)당 한 번만 계산
+    version = get_reference_version(ref_df)
+    index = get_stats_index(
+        df_typed, cache_key=(version, exhibition_type) if version else None
+    )
+
     # 카테고리별 인사이트 생성 (유형 필터링된 데이터로 비교)
     all_insights = []
-    all_insights.extend(_analyze_visitors(current_data, df_typed, group_label))
-    all_insights.extend(_analyze_budget(current_data, df_typed, group_label))
-    all_insights.extend(_analyze_programs(current_data, df_typed, group_label))
-    all_insights.extend(_analyze_promotion(current_data, df_typed, group_label))
-    all_insights.extend(_analyze_artworks(current_data, df_typed, group_label))
+    all_insights.extend(_analyze_visitors(current_data, df_typed, index, group_label))
+    all_insights.extend(_analyze_budget(current_data, df_typed, index, group_label))
+    all_insights.extend(_analyze_programs(current_data, df_typed, index, group_label))
+    all_insights.extend(_analyze_promotion(current_data, df_typed, index, group_label))
+    all_insights.extend(_analyze_artworks(current_data, df_typed, index, group_label))
 
     # 교차 인사이트 (지표 간 관계 서사)
-    all_insights.extend(_analyze_cross_metrics(current_data, df_typed, group_label))
+    all_insights.extend(_analyze_cross_metrics(current_data, df_typed, index, group_label))
 
     # 유사 전시 비교 (전체 데이터에서 검색)
-    similar_rows, comparison_table = _build_similar_comparison(current_data, df_full)
+    similar_rows, comparison_table = _build_similar_comparison(
+        current_data, df_full, cache_key=(version, "all") if version else None
+    )
     similar_insight = _generate_similar_insight(current_data, similar_rows)
     if similar_insight:
         all_insights.append(similar_insight)
 
+    # 기간별 비교 (역대·최근 N년을 연도별 누적 집계로 한 번에)
+    period_comparison, period_table = _build_period_comparison(
+        current_data, ref_df, exhibition_type,
+        label_prefix=f"{get_type_label(exhibition_type)} " if is_type_filtered else "",
+    )
+    period_insight = _generate_period_insight(period_comparison, group_label)
+    if period_insight:
+        all_insights.append(period_insight)
+
     # 우선순위로 정렬
     all_insights.sort(key=lambda x: x.priority)
 
@@ -812,9 +954,65 @@ def generate_all_insights(
         insights=all_insights,
         similar_exhibitions=similar_rows,
         similar_comparison_table=comparison_table,
+        period_comparison_table=period_table,
     )
 
 
+# ──────────────────────────────────────────────
+# 분석 결과 캐시 (Streamlit rerun 대응)
+# ──────────────────────────────────────────────
+
+INSIGHT_CACHE_SIZE = 32  # 보관할 최대 분석 결과 수 (LRU)
+
+_insight_cache: "OrderedDict[tuple, AnalysisResult]" = OrderedDict()
+_insight_cache_lock = threading.Lock()  # Streamlit 세션 스레드 간 동시 접근 보호
+
+
+def _hash_current_data(current_data: dict) -> str:
+    """현재 전시 flat dict의 안정적 해시 (키 순서와 무관)"""
+    payload = json.dumps(current_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generate_all_insights_cached(
+    current_data: dict,
+    ref_df: pd.DataFrame,
+    exhibition_type=None,
+) -> AnalysisResult:
+    """
+    generate_all_insights의 메모이즈 버전.
+
+    (현재 데이터 해시, 전시 유형, 레퍼런스 버전)이 같으면 이전 AnalysisResult를 그대로 반환합니다.
+    레퍼런스 버전을 알 수 없는 DataFrame(load_reference를 거치지 않은 것)은 캐시하지 않습니다.
+    반환된 결과는 캐시와 공유되므로 수정하지 마세요.
+    """
+    version = get_reference_version(ref_df)
+    if not version:
+        return generate_all_insights(current_data, ref_df, exhibition_type)
+
+    key = (_hash_current_data(current_data), exhibition_type, version)
+    with _insight_cache_lock:
+        result = _insight_cache.get(key)
+        if result is not None:
+            _insight_cache.move_to_end(key)
+            return result
+
+    # 분석 자체는 잠금 밖에서 (다른 세션의 조회를 막지 않도록)
+    result = generate_all_insights(current_data, ref_df, exhibition_type)
+    with _insight_cache_lock:
+        result = _insight_cache.setdefault(key, result)
+        _insight_cache.move_to_end(key)
+        while len(_insight_cache) > INSIGHT_CACHE_SIZE:
+            _insight_cache.popitem(last=False)
+    return result
+
+
+def clear_insight_cache():
+    """분석 결과 캐시를 비웁니다."""
+    with _insight_cache_lock:
+        _insight_cache.clear()
+
+
 def get_insights_by_category(result: AnalysisResult) -> dict[str, list[Insight]]:
     """인사이트를 카테고리별로 그룹핑합니다."""
     grouped = {}
@@ -12,6 +12,8 @@ from datetime import date
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import reference_data as rd
+import reference_store as rs
+import chart_generator as cg
 
 from tabs import tab1_overview, tab2_theme, tab3_composition
 from tabs import tab4_results, tab5_promotion, tab6_evaluation
@@ -168,20 +170,33 @@ st.markdown('<div class="sub-header">전시 정보를 입력하면 보고서를
 
 @st.cache_data
 def load_reference_data():
-    """레퍼런스 Excel을 캐시하여 로드"""
-    ref_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exhibition_reference_data.xlsx")
-    if not os.path.exists(ref_path):
-        alt_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exhibition_reference_data.xlsx")
-        if os.path.exists(alt_path):
-            ref_path = alt_path
-        else:
-            return None
+    """레퍼런스 저장소를 캐시하여 로드 (저장소가 없으면 Excel을 가져와 생성)
+
+    REFERENCE_BACKEND=xlsx 환경 변수를 주면 저장소 없이 Excel을 직접 읽습니다.
+    """
+    # 저장소를 만들 수 없는 환경(읽기 전용 등)이면 Excel — 추가·내보내기도 같은 원본을 사용
+    ref_path, _ = rs.resolve_reference_source(os.path.dirname(os.path.abspath(__file__)))
+    if ref_path is None:
+        return None
     try:
         return rd.load_reference(ref_path)
     except Exception:
         return None
 
 
+# ──────────────────────────────────────────────
+# 차트 준비 (KOREAN_FONT_PATH 환경 변수로 폰트 지정 가능)
+# ──────────────────────────────────────────────
+
+@st.cache_resource
+def warm_up_charts():
+    """matplotlib·한글 폰트를 프로세스당 한 번, 백그라운드에서 미리 로드 (첫 화면을 막지 않음)"""
+    return cg.prewarm_in_background()
+
+
+warm_up_charts()
+
+
 # ──────────────────────────────────────────────
 # 탭 구성
 # ──────────────────────────────────────────────
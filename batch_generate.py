@@ -0,0 +1,226 @@
+"""
+보고서 일괄 생성 (헤드리스 배치 모드)
+- '보고서 생성' 탭에서 저장한 JSON 파일들로 .docx를 한꺼번에 생성
+- CPU 코어 수만큼 프로세스를 띄워 병렬 생성, 파일별 소요 시간·실패 보고
+- 작업 프로세스는 재사용되므로 폰트·차트 캐시가 작업 간에 공유되고,
+  디스크 차트 캐시(--chart-cache-dir)는 모든 프로세스가 함께 사용
+
+사용 예:
+    python batch_generate.py archive/*.json -o reports/
+    python batch_generate.py archive/ -o reports/ -j 4 --summary summary.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import chart_generator as cg
+from report_generator import ExhibitionReportGenerator
+
+
+# ──────────────────────────────────────────────
+# 데이터 구조
+# ──────────────────────────────────────────────
+
+@dataclass
+class BatchResult:
+    """파일 하나의 생성 결과"""
+    input_path: str
+    output_path: Optional[str]
+    ok: bool
+    seconds: float
+    error: Optional[str] = None
+
+
+# ──────────────────────────────────────────────
+# 작업 프로세스
+# ──────────────────────────────────────────────
+
+def _init_worker():
+    """작업 프로세스 시작 시 matplotlib·한글 폰트를 한 번만 준비"""
+    cg.warm_up_fonts()
+
+
+def _generate_one(input_path, output_path):
+    """JSON 하나 → .docx 하나. 실패도 예외 대신 BatchResult로 반환."""
+    start = time.perf_counter()
+    try:
+        with open(input_path, encoding="utf-8") as f:
+            data = json.load(f)
+        ExhibitionReportGenerator(data).generate(output_path)
+        return BatchResult(input_path, output_path, True, time.perf_counter() - start)
+    except Exception as e:
+        return BatchResult(
+            input_path, None, False, time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}\n{traceback.format_exc()}",
+        )
+
+
+# ──────────────────────────────────────────────
+# 배치 실행
+# ──────────────────────────────────────────────
+
+def collect_inputs(paths):
+    """파일/디렉토리/글롭 패턴 목록 → 정렬된 JSON 파일 목록 (중복 제거)"""
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            found.extend(glob.glob(os.path.join(p, "*.json")))
+        elif any(ch in p for ch in "*?["):
+            found.extend(glob.glob(p))
+        else:
+            found.append(p)
+    return sorted(dict.fromkeys(os.path.abspath(p) for p in found))
+
+
+def output_path_for(input_path, output_dir, base_dir=None):
+    """
+    archive/foo.json → output_dir/foo.docx
+
+    base_dir가 주어지면 그 아래의 상대 경로를 그대로 살립니다
+    (base_dir=archive: archive/2023/foo.json → output_dir/2023/foo.docx).
+    """
+    if base_dir is None:
+        rel = os.path.basename(input_path)
+    else:
+        rel = os.path.relpath(input_path, base_dir)
+    return os.path.join(output_dir, os.path.splitext(rel)[0] + ".docx")
+
+
+def output_paths_for(input_paths, output_dir):
+    """
+    입력 목록 전체의 출력 경로 {입력: 출력}.
+
+    입력들의 공통 상위 폴더 아래 상대 경로를 output_dir에 그대로 옮기므로
+    a/report.json과 b/report.json은 output_dir/a/report.docx, output_dir/b/report.docx가 됩니다.
+    그래도 겹치는 출력(예: foo.json과 foo.JSON)이 있으면 생성 전에 ValueError.
+    """
+    if not input_paths:
+        return {}
+    base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in input_paths])
+    outputs = {p: output_path_for(os.path.abspath(p), output_dir, base_dir) for p in input_paths}
+
+    seen = {}
+    for path, out in outputs.items():
+        key = os.path.normcase(os.path.abspath(out))
+        if key in seen:
+            raise ValueError(f"출력 파일이 겹칩니다: {seen[key]}, {path} → {out}")
+        seen[key] = path
+    return outputs
+
+
+def run_batch(input_paths, output_dir, jobs=None, on_result=None):
+    """
+    JSON 파일 목록으로 보고서를 병렬 생성합니다.
+
+    Args:
+        input_paths: JSON 파일 경로 목록
+        output_dir: .docx 저장 디렉토리 (없으면 생성)
+        jobs: 동시 작업 프로세스 수 (None이면 CPU 수)
+        on_result: 결과가 나올 때마다 호출할 함수 (BatchResult 인자)
+
+    Returns:
+        입력 순서대로 정렬된 BatchResult 목록
+
+    Raises:
+        ValueError: 서로 다른 입력의 출력 경로가 겹칠 때 (output_paths_for 참고)
+    """
+    outputs = output_paths_for(input_paths, output_dir)
+    for out in outputs.values():
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(input_paths) or 1))
+
+    results = {}
+    if jobs == 1:
+        _init_worker()
+        for path in input_paths:
+            result = _generate_one(path, outputs[path])
+            results[path] = result
+            if on_result:
+                on_result(result)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            futures = {
+                pool.submit(_generate_one, path, outputs[path]): path
+                for path in input_paths
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # 작업 프로세스 자체가 죽은 경우
+                    result = BatchResult(path, None, False, 0.0, error=f"{type(e).__name__}: {e}")
+                results[path] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[p] for p in input_paths]
+
+
+# ──────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────
+
+def _print_result(result):
+    name = os.path.basename(result.input_path)
+    if result.ok:
+        print(f"[완료] {name} → {result.output_path} ({result.seconds:.2f}초)")
+    else:
+        first_line = result.error.splitlines()[0] if result.error else ""
+        print(f"[실패] {name} ({result.seconds:.2f}초): {first_line}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 JSON 데이터로 전시보고서를 일괄 생성합니다.")
+    parser.add_argument("inputs", nargs="+", help="JSON 파일, 디렉토리 또는 글롭 패턴")
+    parser.add_argument("-o", "--output-dir", default="reports", help="보고서 저장 디렉토리 (기본: reports)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="동시 작업 수 (기본: CPU 수)")
+    parser.add_argument("--chart-cache-dir", default=None,
+                        help="작업 간 공유할 디스크 차트 캐시 디렉토리 (기본: <output-dir>/.chart_cache)")
+    parser.add_argument("--summary", default=None, help="파일별 결과를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    input_paths = collect_inputs(args.inputs)
+    if not input_paths:
+        print("처리할 JSON 파일이 없습니다.", file=sys.stderr)
+        return 2
+
+    # 작업 프로세스가 환경 변수를 물려받아 같은 디스크 캐시를 사용
+    cache_dir = args.chart_cache_dir or os.path.join(args.output_dir, ".chart_cache")
+    os.environ[cg.CHART_CACHE_DIR_ENV] = os.path.abspath(cache_dir)
+    cg.configure_chart_cache(disk_dir=os.path.abspath(cache_dir))
+
+    start = time.perf_counter()
+    try:
+        results = run_batch(input_paths, args.output_dir, jobs=args.jobs, on_result=_print_result)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r.ok]
+    print()
+    print(f"총 {len(results)}건 — 성공 {len(results) - len(failed)}건, 실패 {len(failed)}건, "
+          f"경과 {elapsed:.2f}초 (파일별 합계 {sum(r.seconds for r in results):.2f}초)")
+    for r in failed:
+        print(f"\n[실패] {r.input_path}\n{r.error}", file=sys.stderr)
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({"elapsed": elapsed, "results": [asdict(r) for r in results]},
+                      f, ensure_ascii=False, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
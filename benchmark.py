@@ -0,0 +1,413 @@
+"""
+보고서 생성 벤치마크
+- collect_data와 같은 구조의 가상 전시 데이터를 규모별로 생성
+  (전시실·사진·언론 보도·예산 상세·관객 후기 수 조절)
+- 케이스마다 새 프로세스에서 ExhibitionReportGenerator.generate를 반복 실행하여
+  소요 시간(첫 실행·반복 중앙값), 최대 메모리, 출력 크기, 출력 지문을 측정
+- 저장된 기준값(baseline)과 비교하여 성능 저하·출력 변경을 보고
+
+사용 예:
+    python benchmark.py                          # 기본 케이스 측정
+    python benchmark.py --save-baseline          # 현재 결과를 기준값으로 저장
+    python benchmark.py --compare                # 기준값과 비교 (저하 시 종료 코드 1)
+    python benchmark.py --cases large -r 5 --rooms 8 --photos 10
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, replace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# ──────────────────────────────────────────────
+# 설정
+# ──────────────────────────────────────────────
+
+BASELINE_PATH = "benchmark_baseline.json"
+FIXTURE_DIR = os.path.join(tempfile.gettempdir(), "exhibition_report_bench")
+
+# 기준값 대비 허용 증가율
+TIME_TOLERANCE = 0.20
+MEMORY_TOLERANCE = 0.20
+SIZE_TOLERANCE = 0.10
+
+
+@dataclass
+class BenchCase:
+    """벤치마크 케이스 (가상 전시 규모)"""
+    name: str
+    rooms: int = 2
+    photos_per_room: int = 3
+    press: int = 4
+    budget_rows: int = 4
+    reviews: int = 4
+    photo_size: tuple = (4000, 3000)  # 카메라 원본 해상도 가정
+
+
+DEFAULT_CASES = {
+    "small": BenchCase("small", rooms=1, photos_per_room=2, press=2, budget_rows=4, reviews=2),
+    "medium": BenchCase("medium", rooms=3, photos_per_room=4, press=10, budget_rows=20, reviews=10),
+    "large": BenchCase("large", rooms=5, photos_per_room=6, press=40, budget_rows=100, reviews=40),
+}
+
+
+# ──────────────────────────────────────────────
+# 가상 데이터
+# ──────────────────────────────────────────────
+
+def _make_photo(path, size, seed):
+    """재현 가능한 가상 사진 (그라데이션 + 노이즈 — JPEG 압축률이 실제 사진과 비슷)"""
+    if os.path.exists(path):
+        return path
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    w, h = size
+    x = np.linspace(0, 1, w, dtype=np.float32)
+    y = np.linspace(0, 1, h, dtype=np.float32)[:, None]
+    base = rng.random(3, dtype=np.float32) * 200
+    img = np.stack([base[i] + 55 * (x * (i % 2) + y * ((i + 1) % 2)) for i in range(3)], axis=-1)
+    img += rng.normal(0, 12, img.shape).astype(np.float32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    Image.fromarray(np.clip(img, 0, 255).astype(np.uint8)).save(tmp, format="JPEG", quality=92)
+    os.replace(tmp, path)
+    return path
+
+
+def _make_floor_plan(path, seed):
+    """재현 가능한 가상 도면 (흰 바탕 선 그림 → PNG 경로)"""
+    if os.path.exists(path):
+        return path
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    img = Image.new("RGB", (3000, 2000), "white")
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x0, y0 = rng.randrange(0, 2500), rng.randrange(0, 1500)
+        draw.rectangle((x0, y0, x0 + rng.randrange(100, 500), y0 + rng.randrange(100, 500)),
+                       outline="black", width=6)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    img.save(tmp, format="PNG")
+    os.replace(tmp, path)
+    return path
+
+
+def make_fixture(case, image_dir=FIXTURE_DIR, seed=0):
+    """
+    collect_data와 같은 구조의 가상 보고서 데이터를 만듭니다.
+    같은 케이스·seed면 같은 데이터와 같은 이미지 파일을 돌려줍니다.
+    """
+    rng = random.Random(f"{case.name}:{seed}")
+    w, h = case.photo_size
+    photo = lambda key: _make_photo(
+        os.path.join(image_dir, f"photo_{w}x{h}_{key}.jpg"), case.photo_size,
+        int(hashlib.sha1(key.encode()).hexdigest()[:8], 16))
+
+    weekly = {f"{i}주": rng.randrange(500, 1500) for i in range(1, 9)}
+    ticket = {"일반": rng.randrange(2000, 5000), "학생": rng.randrange(300, 1500),
+              "초대권": rng.randrange(100, 800), "예술인패스": rng.randrange(100, 600)}
+    categories = ["전시 사업비", "부대 사업비", "홍보비"]
+    chart_data = {c: {"planned": rng.randrange(5, 150) * 1_000_000,
+                      "actual": rng.randrange(5, 150) * 1_000_000} for c in categories}
+
+    return {
+        "exhibition_title": f"벤치마크 전시 {case.name}",
+        "exhibition_period": "2024.09.06 - 2024.10.27",
+        "poster_image": photo(f"{case.name}_poster"),
+        "overview": {
+            "title": f"벤치마크 전시 {case.name}",
+            "period": "2024.09.06(금) - 2024.10.27(일) (52일간, 월요일 휴관)",
+            "artists": [f"작가{i}" for i in range(1, case.rooms * 2 + 1)],
+            "chief_curator": "김책임", "curators": "이기획", "coordinators": "박진행",
+            "curatorial_team": "", "pr": "최홍보", "sponsors": "한국문화예술위원회",
+            "total_budget": "142,438,012원", "budget_breakdown": ["지출 구성: 전시비 / 부대비"],
+            "total_revenue": "49,574,000원", "programs": "총 8개 프로그램",
+            "staff_count": "스태프 10명, 봉사단 12명", "visitors": f"{sum(ticket.values()):,}명",
+        },
+        "theme_text": "전시 주제 설명 문단입니다. " * 40,
+        "rooms": [
+            {
+                "name": f"{r}전시실",
+                "artists": f"작가{r * 2 - 1}, 작가{r * 2}",
+                "floor_plan": _make_floor_plan(os.path.join(image_dir, f"floor_{r}.png"), r),
+                "photos": [photo(f"{case.name}_room{r}_{j}") for j in range(case.photos_per_room)],
+            }
+            for r in range(1, case.rooms + 1)
+        ],
+        "related_programs": [
+            {"category": "워크숍", "title": f"프로그램 {i}", "date": "2024.09.20",
+             "participants": str(rng.randrange(10, 80)), "note": ""}
+            for i in range(1, 6)
+        ],
+        "program_photos": [],
+        "staff": {
+            "main_staff": {"count": "총 10명", "role": "전시 안내, 관객 응대"},
+            "volunteers": {"count": "총 12명", "role": "전시 안내 보조"},
+        },
+        "printed_materials": [{"type": "리플렛", "quantity": "5,000부", "note": ""}],
+        "material_photos": [],
+        "budget": {
+            "total_spent": "142,438,012원",
+            "breakdown_notes": ["지출 구성: 전시비 / 부대비"],
+            "summary": [{"category": c, "planned": f"{v['planned']:,}", "actual": f"{v['actual']:,}",
+                         "note": ""} for c, v in chart_data.items()],
+            "arrow_notes": ["예산 집행률 설명"],
+            "chart_data": chart_data,
+            "details": [
+                {"category": rng.choice(["전시비", "부대비"]), "subcategory": f"세부 항목 {i}",
+                 "detail": "세부 내역 설명", "amount": f"{rng.randrange(1, 50) * 100_000:,}", "note": ""}
+                for i in range(case.budget_rows)
+            ],
+        },
+        "revenue": {
+            "total_visitors": f"{sum(ticket.values()):,}명", "daily_average": "135명",
+            "visitor_notes": ["관객 수 설명"], "total_revenue": "49,574,000원",
+            "ticket_revenue": "42,574,000원", "partnership_revenue": "7,000,000원",
+            "revenue_notes": [],
+        },
+        "visitor_composition": {
+            "note": "", "ticket_type": ticket, "ticket_analysis": ["권종별 분석"],
+            "visitor_type": {"개인": 5500, "미술대학 단체": 600, "기타 단체": 400},
+            "weekly_visitors": weekly, "analysis": "관객 구성 분석 문단입니다.",
+        },
+        "promotion": {"advertising": "지하철 포스터", "press_release": "보도자료 3회",
+                      "sns": "인스타그램 게시물 35회"},
+        "promotion_photos": [],
+        "press_coverage": {
+            "print_media": [{"outlet": f"신문{i}", "date": "2024.09.07", "title": f"기사 {i}", "note": ""}
+                            for i in range(case.press // 2)],
+            "online_media": [{"outlet": f"매체{i}", "date": "2024.09.08", "title": f"온라인 기사 {i}", "url": ""}
+                             for i in range(case.press - case.press // 2)],
+        },
+        "membership": "멤버십 프리뷰 행사",
+        "evaluation": {"positive": ["긍정 평가"], "negative": ["부정 평가"], "improvements": ["개선 방안"]},
+        "visitor_reviews": [
+            {"category": rng.choice(["긍정", "부정"]), "content": f"관객 후기 {i} 내용입니다.", "source": "방명록"}
+            for i in range(case.reviews)
+        ],
+    }
+
+
+# ──────────────────────────────────────────────
+# 측정
+# ──────────────────────────────────────────────
+
+def output_fingerprint(docx_bytes):
+    """출력 .docx의 내용 지문 (본문 XML + 이미지 파트 내용, zip 타임스탬프·임시 이름 무시)"""
+    h = hashlib.sha256()
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as z:
+        xml = z.read("word/document.xml").decode("utf-8")
+        h.update(re.sub(r'name="[^"]*"', 'name=""', xml).encode("utf-8"))
+        for media in sorted(hashlib.sha256(z.read(n)).hexdigest()
+                            for n in z.namelist() if n.startswith("word/media/")):
+            h.update(media.encode())
+    return h.hexdigest()[:16]
+
+
+def _max_rss_mb():
+    """프로세스 최대 RSS (MB). resource 모듈이 없는 환경(Windows)에서는 None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024  # macOS는 바이트, Linux는 KB
+
+
+def _use_fresh_caches(cache_root):
+    """차트·이미지 디스크 캐시를 cache_root 아래의 빈 디렉토리로 교체 (첫 실행을 콜드 캐시로)"""
+    import chart_generator as cg
+    import image_processing
+
+    cg.get_chart_cache().clear()
+    cg.configure_chart_cache(disk_dir=os.path.join(cache_root, "charts"))
+    image_processing.configure_image_cache(os.path.join(cache_root, "images"))
+
+
+def run_case(case, repeat=3):
+    """
+    케이스 하나를 현재 프로세스에서 repeat번 생성하여 측정합니다.
+
+    차트·이미지 캐시는 케이스마다 새 임시 디렉토리를 쓰므로 첫 실행은 콜드 캐시,
+    이후는 캐시가 채워진 상태입니다. 시간 측정에는 tracemalloc을 켜지 않고,
+    Python 최대 메모리는 마지막에 한 번 더 생성하며 따로 잽니다.
+    """
+    from report_generator import ExhibitionReportGenerator
+
+    data = make_fixture(case)
+    cache_root = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        _use_fresh_caches(cache_root)
+
+        times = []
+        output = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            output = ExhibitionReportGenerator(data).generate()
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            ExhibitionReportGenerator(data).generate()
+            python_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    warm = times[1:] or times
+    return {
+        "case": asdict(case),
+        "first_seconds": times[0],
+        "median_seconds": statistics.median(warm),
+        "python_peak_mb": python_peak / 1024 / 1024,
+        "max_rss_mb": _max_rss_mb(),
+        "output_bytes": len(output),
+        "fingerprint": output_fingerprint(output),
+    }
+
+
+def run_cases(cases, repeat=3):
+    """케이스마다 새 프로세스에서 측정 (최대 메모리·콜드 캐시를 케이스별로 분리)"""
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results[case.name] = pool.submit(run_case, case, repeat).result()
+    return results
+
+
+# ──────────────────────────────────────────────
+# 기준값 비교
+# ──────────────────────────────────────────────
+
+def compare_to_baseline(results, baseline):
+    """
+    기준값 대비 저하 항목 목록을 반환합니다.
+
+    Returns:
+        [(케이스, 항목, 기준값, 현재값)] — 비어 있으면 저하 없음
+    """
+    checks = [
+        ("median_seconds", TIME_TOLERANCE),
+        ("first_seconds", TIME_TOLERANCE),
+        ("max_rss_mb", MEMORY_TOLERANCE),
+        ("output_bytes", SIZE_TOLERANCE),
+    ]
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if base.get("case") != json.loads(json.dumps(current["case"])):  # 튜플 → 리스트
+            regressions.append((name, "case", base.get("case"), current["case"]))
+            continue
+        for key, tolerance in checks:
+            if base.get(key) is None or current.get(key) is None:
+                continue  # 측정할 수 없는 환경 (예: Windows의 max_rss_mb)
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append((name, key, base[key], current[key]))
+        if base.get("fingerprint") and base["fingerprint"] != current["fingerprint"]:
+            regressions.append((name, "fingerprint", base["fingerprint"], current["fingerprint"]))
+    return regressions
+
+
+# ──────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────
+
+def _print_results(results, baseline=None):
+    print(f"{'케이스':<10}{'첫 실행':>10}{'반복 중앙값':>12}{'Python 최대':>13}{'RSS 최대':>11}{'출력':>10}  지문")
+    for name, r in results.items():
+        rss = f"{r['max_rss_mb']:>9.1f}MB" if r["max_rss_mb"] is not None else f"{'—':>11}"
+        line = (f"{name:<10}{r['first_seconds']:>9.2f}초{r['median_seconds']:>11.2f}초"
+                f"{r['python_peak_mb']:>11.1f}MB{rss}"
+                f"{r['output_bytes'] / 1024:>8.0f}KB  {r['fingerprint']}")
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"  (기준 {base['median_seconds']:.2f}초, " \
+                    f"{(r['median_seconds'] / base['median_seconds'] - 1) * 100:+.0f}%)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보고서 생성 벤치마크")
+    parser.add_argument("--cases", nargs="+", default=list(DEFAULT_CASES),
+                        help=f"측정할 케이스 (기본: {' '.join(DEFAULT_CASES)})")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="케이스별 반복 횟수 (기본: 3)")
+    parser.add_argument("--rooms", type=int, help="전시실 수 덮어쓰기")
+    parser.add_argument("--photos", type=int, help="전시실별 사진 수 덮어쓰기")
+    parser.add_argument("--press", type=int, help="언론 보도 수 덮어쓰기")
+    parser.add_argument("--budget-rows", type=int, help="예산 상세 행 수 덮어쓰기")
+    parser.add_argument("--reviews", type=int, help="관객 후기 수 덮어쓰기")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help=f"기준값 파일 (기본: {BASELINE_PATH})")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--compare", action="store_true", help="기준값과 비교하여 저하 시 종료 코드 1")
+    parser.add_argument("--json", default=None, help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    overrides = {k: v for k, v in {
+        "rooms": args.rooms, "photos_per_room": args.photos, "press": args.press,
+        "budget_rows": args.budget_rows, "reviews": args.reviews,
+    }.items() if v is not None}
+    try:
+        cases = [replace(DEFAULT_CASES[name], **overrides) for name in args.cases]
+    except KeyError as e:
+        print(f"알 수 없는 케이스: {e}", file=sys.stderr)
+        return 2
+
+    results = run_cases(cases, repeat=args.repeat)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baseline or {})
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+
+    if args.compare:
+        if baseline is None:
+            print(f"\n기준값 파일이 없습니다: {args.baseline}", file=sys.stderr)
+            return 2
+        regressions = compare_to_baseline(results, baseline)
+        if regressions:
+            print("\n[저하]")
+            for name, key, base, current in regressions:
+                print(f"  {name} {key}: {base} → {current}")
+            return 1
+        print("\n기준값 대비 저하 없음")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
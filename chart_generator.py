@@ -4,45 +4,133 @@
 - 유형별 관객 구성 파이차트
 - 주별 관객 수 바 차트
 - 예산 계획 대비 집행 비교 차트
+
+matplotlib은 첫 차트 요청 시점에 import합니다 (앱 시작 시간 단축).
+prewarm_in_background()로 백그라운드에서 미리 로드할 수 있습니다.
 """
 
-import matplotlib
-matplotlib.use('Agg')  # GUI 없이 사용
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import hashlib
+import inspect
+import io
+import json
 import os
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# ──────────────────────────────────────────────
+# matplotlib 지연 로드
+# ──────────────────────────────────────────────
+
+plt = None  # matplotlib.pyplot (첫 사용 시 로드)
+fm = None   # matplotlib.font_manager
+_matplotlib_lock = threading.Lock()
+
+
+def _load_matplotlib():
+    """matplotlib(Agg 백엔드)과 font_manager를 한 번만 import"""
+    global plt, fm
+    if plt is None:
+        with _matplotlib_lock:
+            if plt is None:
+                import matplotlib
+                matplotlib.use('Agg')  # GUI 없이 사용
+                import matplotlib.font_manager as font_manager
+                import matplotlib.pyplot as pyplot
+                fm = font_manager
+                plt = pyplot
+    return plt
+
+
+_prewarm_thread = None
+
+
+def prewarm_in_background():
+    """matplotlib import, 폰트 탐색, Agg 첫 렌더링을 백그라운드 스레드에서 미리 수행
+
+    여러 번 호출해도 스레드는 하나만 시작합니다.
+
+    Returns:
+        threading.Thread (완료를 기다리려면 join())
+    """
+    global _prewarm_thread
+    with _matplotlib_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(
+                target=_prewarm, name="chart-prewarm", daemon=True
+            )
+            _prewarm_thread.start()
+    return _prewarm_thread
+
+
+def _prewarm():
+    try:
+        _load_matplotlib()
+        font_prop = get_font_prop()
+        # pyplot 상태를 건드리지 않도록 Figure를 직접 만들어 렌더러·글리프 캐시 초기화
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(1, 1))
+        fig.text(0.5, 0.5, '가1', fontproperties=font_prop)
+        fig.savefig(io.BytesIO(), format='png', dpi=CHART_DPI)
+    except Exception:
+        pass  # 미리 준비는 최적화일 뿐, 실패해도 첫 차트에서 다시 시도
+
 
 # ──────────────────────────────────────────────
 # 한글 폰트 설정
 # ──────────────────────────────────────────────
 
-def setup_korean_font():
-    """한글 폰트 설정 - Noto Sans CJK 우선, 환경에 따라 자동 탐색"""
-    font_candidates = [
-        # Noto Sans CJK (우선)
-        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/opentype/noto/NotoSansCJKkr-Regular.otf',
-        '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/truetype/noto/NotoSansCJKkr-Regular.otf',
-        '/usr/share/fonts/noto-cjk/NotoSansCJKkr-Regular.otf',
-        # macOS
-        '/System/Library/Fonts/Supplemental/NotoSansCJKkr-Regular.otf',
-        '/Library/Fonts/NotoSansCJKkr-Regular.otf',
-        # Windows
-        'C:/Windows/Fonts/NotoSansCJKkr-Regular.otf',
-        # Fallback: Nanum Gothic
-        '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
-        '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf',
-        # Fallback: 맑은 고딕 (Windows)
-        'C:/Windows/Fonts/malgun.ttf',
-        # Fallback: Apple Gothic
-        '/System/Library/Fonts/AppleGothic.ttf',
-    ]
-
-    for font_path in font_candidates:
+KOREAN_FONT_ENV = "KOREAN_FONT_PATH"  # 설정 시 이 폰트 파일을 최우선으로 사용
+
+FONT_CANDIDATES = [
+    # Noto Sans CJK (우선)
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/opentype/noto/NotoSansCJKkr-Regular.otf',
+    '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/noto/NotoSansCJKkr-Regular.otf',
+    '/usr/share/fonts/noto-cjk/NotoSansCJKkr-Regular.otf',
+    # macOS
+    '/System/Library/Fonts/Supplemental/NotoSansCJKkr-Regular.otf',
+    '/Library/Fonts/NotoSansCJKkr-Regular.otf',
+    # Windows
+    'C:/Windows/Fonts/NotoSansCJKkr-Regular.otf',
+    # Fallback: Nanum Gothic
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf',
+    # Fallback: 맑은 고딕 (Windows)
+    'C:/Windows/Fonts/malgun.ttf',
+    # Fallback: Apple Gothic
+    '/System/Library/Fonts/AppleGothic.ttf',
+]
+
+_UNRESOLVED = object()
+_font_prop = _UNRESOLVED
+_font_override = None  # warm_up_fonts(font_path)로 지정한 폰트 파일
+_font_lock = threading.Lock()
+
+
+def _configured_font_path():
+    """KOREAN_FONT_PATH 또는 후보 목록에서 처음 존재하는 폰트 파일 (matplotlib 없이 확인)"""
+    override = os.environ.get(KOREAN_FONT_ENV)
+    if override and os.path.exists(override):
+        return override
+    for font_path in FONT_CANDIDATES:
         if os.path.exists(font_path):
-            return fm.FontProperties(fname=font_path)
+            return font_path
+    return None
+
+
+def setup_korean_font():
+    """한글 폰트 설정 - Noto Sans CJK 우선, 환경에 따라 자동 탐색
+
+    환경 변수 KOREAN_FONT_PATH로 폰트 파일을 직접 지정할 수 있습니다.
+    매 호출마다 탐색하므로, 차트에서는 캐시된 get_font_prop()을 사용하세요.
+    """
+    _load_matplotlib()
+    font_path = _configured_font_path()
+    if font_path:
+        return fm.FontProperties(fname=font_path)
 
     # matplotlib font_manager에서 Noto Sans CJK 탐색
     for font in fm.fontManager.ttflist:
@@ -55,9 +143,222 @@ def setup_korean_font():
 
 
 def get_font_prop():
-    """폰트 속성 반환"""
-    prop = setup_korean_font()
-    return prop
+    """폰트 속성 반환 (프로세스당 한 번만 탐색하고 재사용)"""
+    global _font_prop
+    if _font_prop is _UNRESOLVED:
+        with _font_lock:
+            if _font_prop is _UNRESOLVED:
+                _font_prop = setup_korean_font()
+    return _font_prop
+
+
+def warm_up_fonts(font_path=None):
+    """앱 시작 시 호출: 한글 폰트를 미리 찾아 캐시합니다.
+
+    Args:
+        font_path: 사용할 폰트 파일 (None이면 KOREAN_FONT_PATH 또는 자동 탐색)
+
+    Returns:
+        FontProperties (찾지 못하면 None)
+    """
+    global _font_prop, _font_override
+    if font_path:
+        _load_matplotlib()
+        with _font_lock:
+            _font_prop = fm.FontProperties(fname=font_path)
+            _font_override = font_path
+    return get_font_prop()
+
+
+def reset_font_cache():
+    """캐시된 폰트를 버립니다 (다음 차트에서 다시 탐색)."""
+    global _font_prop, _font_override
+    with _font_lock:
+        _font_prop = _UNRESOLVED
+        _font_override = None
+
+
+def _font_key():
+    """차트 캐시 키에 포함할 폰트 식별자 (폰트가 바뀌면 다른 차트)
+
+    폰트를 실제로 찾지 않고 설정으로 정합니다 — warm_up_fonts에 넘긴 파일, KOREAN_FONT_PATH,
+    후보 경로 순. 캐시에서 차트를 꺼낼 때 matplotlib을 import하지 않기 위해서입니다.
+    후보 파일이 하나도 없으면 font_manager 탐색 결과(렌더링할 때 정해짐)를 뜻하는 "auto".
+    """
+    return _font_override or _configured_font_path() or "auto"
+
+
+# ──────────────────────────────────────────────
+# 차트 캐시
+# ──────────────────────────────────────────────
+
+CHART_DPI = 200
+CHART_STYLE_VERSION = 1  # 차트 모양(색상, 크기, 폰트 등)을 바꾸면 올려서 기존 캐시를 무효화
+CHART_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 메모리 캐시 상한 (PNG 바이트 합계)
+CHART_CACHE_DIR_ENV = "CHART_CACHE_DIR"  # 설정 시 디스크 캐시 디렉토리로 사용
+
+
+class ChartCache:
+    """렌더링된 차트 PNG 캐시 (내용 주소 방식)
+
+    - 메모리: 바이트 합계가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 제거 (LRU)
+    - 디스크(선택): disk_dir이 주어지면 {key}.png로 저장하여 프로세스 간 공유
+    """
+
+    def __init__(self, max_bytes=CHART_CACHE_MAX_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+                return png
+
+        png = self._read_disk(key)
+        if png is not None:
+            self._put_memory(key, png)
+        return png
+
+    def put(self, key, png):
+        self._put_memory(key, png)
+        self._write_disk(key, png)
+
+    def resize(self, max_bytes):
+        """메모리 상한을 바꾸고, 넘치는 항목을 즉시 제거합니다."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """메모리 캐시를 비웁니다 (디스크 캐시는 유지)."""
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _put_memory(self, key, png):
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = png
+            self._size += len(png)
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._items:
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.png")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, png):
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.disk_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            pass  # 디스크 캐시 실패는 무시 (메모리 캐시만 사용)
+
+
+_chart_cache = ChartCache(disk_dir=os.environ.get(CHART_CACHE_DIR_ENV) or None)
+
+
+def get_chart_cache():
+    """프로세스 전역 차트 캐시 반환"""
+    return _chart_cache
+
+
+def configure_chart_cache(max_bytes=None, disk_dir=None):
+    """차트 캐시 설정 변경 (메모리 상한, 디스크 캐시 디렉토리)"""
+    if max_bytes is not None:
+        _chart_cache.resize(max_bytes)
+    if disk_dir is not None:
+        _chart_cache.disk_dir = disk_dir or None
+
+
+def _normalize_chart_data(value):
+    """캐시 키용 정규화: dict는 순서를 유지한 (키, 값) 목록, numpy 스칼라는 파이썬 값으로"""
+    if isinstance(value, dict):
+        return [[str(k), _normalize_chart_data(v)] for k, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [_normalize_chart_data(v) for v in value]
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _chart_key(kind, data, title, dpi=CHART_DPI):
+    """(차트 종류, 정규화된 데이터, 제목, dpi, 스타일 버전, 폰트) → sha256 키"""
+    payload = json.dumps(
+        [kind, _normalize_chart_data(data), title, dpi, CHART_STYLE_VERSION, _font_key()],
+        ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _write_png(png, output_path=None):
+    """PNG 바이트를 output_path(경로/파일 객체/None=임시 파일)에 씁니다.
+
+    Returns:
+        파일 경로. 파일 객체를 받은 경우 처음 위치로 되감은 그 객체.
+    """
+    if hasattr(output_path, 'write'):
+        output_path.write(png)
+        output_path.seek(0)
+        return output_path
+
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(suffix='.png')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(png)
+    else:
+        with open(output_path, 'wb') as f:
+            f.write(png)
+    return output_path
+
+
+def _save_figure(fig, output_path=None, cache_key=None, dpi=CHART_DPI):
+    """Figure를 PNG로 렌더링해 닫고, 캐시에 넣은 뒤 output_path에 씁니다.
+
+    Args:
+        output_path: 파일 경로, 또는 BytesIO 등 쓰기 가능한 파일 객체.
+            None이면 고유한 임시 파일(mkstemp)에 저장합니다.
+        cache_key: _chart_key로 만든 키 (None이면 캐시하지 않음)
+
+    Returns:
+        파일 경로. 파일 객체를 받은 경우 처음 위치로 되감은 그 객체.
+    """
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight', facecolor='white')
+    finally:
+        plt.close(fig)
+
+    png = buf.getvalue()
+    if cache_key is not None:
+        _chart_cache.put(cache_key, png)
+    return _write_png(png, output_path)
 
 
 # ──────────────────────────────────────────────
@@ -71,14 +372,17 @@ def create_visitor_pie_chart(data, title="관객 구성", output_path=None):
         data: dict, {"카테고리": 값, ...}
             예: {"일반": 3500, "학생": 1200, "초대권": 300}
         title: 차트 제목
-        output_path: 저장 경로 (None이면 임시 파일)
+        output_path: 저장 경로 또는 BytesIO 등 파일 객체 (None이면 임시 파일)
 
     Returns:
-        저장된 파일 경로
+        저장된 파일 경로 (파일 객체를 넘긴 경우 그 객체)
     """
-    if output_path is None:
-        output_path = tempfile.mktemp(suffix='.png')
+    cache_key = chart_request_key("visitor_pie", {"data": data, "title": title})
+    cached = _chart_cache.get(cache_key)
+    if cached is not None:
+        return _write_png(cached, output_path)
 
+    _load_matplotlib()
     font_prop = get_font_prop()
 
     fig, ax = plt.subplots(1, 1, figsize=(6, 5))
@@ -128,10 +432,7 @@ def create_visitor_pie_chart(data, title="관객 구성", output_path=None):
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
 
     plt.tight_layout()
-    fig.savefig(output_path, dpi=200, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-
-    return output_path
+    return _save_figure(fig, output_path, cache_key=cache_key)
 
 
 # ──────────────────────────────────────────────
@@ -157,14 +458,17 @@ def create_weekly_visitors_chart(data, title="주별 관객 수", output_path=No
     Args:
         data: dict, {"1주": 500, "2주": 620, ...}
         title: 차트 제목
-        output_path: 저장 경로
+        output_path: 저장 경로 또는 BytesIO 등 파일 객체 (None이면 임시 파일)
 
     Returns:
-        저장된 파일 경로
+        저장된 파일 경로 (파일 객체를 넘긴 경우 그 객체)
     """
-    if output_path is None:
-        output_path = tempfile.mktemp(suffix='.png')
+    cache_key = chart_request_key("weekly_bar", {"data": data, "title": title})
+    cached = _chart_cache.get(cache_key)
+    if cached is not None:
+        return _write_png(cached, output_path)
 
+    _load_matplotlib()
     font_prop = get_font_prop()
 
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -196,10 +500,7 @@ def create_weekly_visitors_chart(data, title="주별 관객 수", output_path=No
     ax.grid(axis='y', alpha=0.3)
 
     plt.tight_layout()
-    fig.savefig(output_path, dpi=200, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-
-    return output_path
+    return _save_figure(fig, output_path, cache_key=cache_key)
 
 
 # ──────────────────────────────────────────────
@@ -215,14 +516,19 @@ def create_budget_comparison_chart(categories, planned, actual,
         planned: list, [계획액, ...]
         actual: list, [집행액, ...]
         title: 차트 제목
-        output_path: 저장 경로
+        output_path: 저장 경로 또는 BytesIO 등 파일 객체 (None이면 임시 파일)
 
     Returns:
-        저장된 파일 경로
+        저장된 파일 경로 (파일 객체를 넘긴 경우 그 객체)
     """
-    if output_path is None:
-        output_path = tempfile.mktemp(suffix='.png')
-
+    cache_key = chart_request_key("budget_comparison", {
+        "categories": categories, "planned": planned, "actual": actual, "title": title,
+    })
+    cached = _chart_cache.get(cache_key)
+    if cached is not None:
+        return _write_png(cached, output_path)
+
+    _load_matplotlib()
     font_prop = get_font_prop()
 
     fig, ax = plt.subplots(figsize=(8, 5))
@@ -269,10 +575,7 @@ def create_budget_comparison_chart(categories, planned, actual,
     ax.grid(axis='y', alpha=0.3)
 
     plt.tight_layout()
-    fig.savefig(output_path, dpi=200, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-
-    return output_path
+    return _save_figure(fig, output_path, cache_key=cache_key)
 
 
 # 하위 호환: 기존 함수 이름 유지
@@ -286,6 +589,75 @@ def create_age_distribution_chart(data, title="연령대별 관객 구성", outp
     return create_visitor_type_chart(data, title=title, output_path=output_path)
 
 
+# ──────────────────────────────────────────────
+# 여러 차트 한꺼번에 렌더링
+# ──────────────────────────────────────────────
+
+# 차트 종류 이름 → 생성 함수. 요청은 (종류, 키워드 인자 dict)로 표현합니다.
+CHART_RENDERERS = {
+    "visitor_pie": create_visitor_pie_chart,
+    "visitor_type": create_visitor_type_chart,
+    "weekly_bar": create_weekly_visitors_chart,
+    "budget_comparison": create_budget_comparison_chart,
+}
+
+# 같은 그림을 그리는 종류는 캐시 키를 공유
+_CHART_KEY_KINDS = {"visitor_type": "visitor_pie"}
+
+def chart_request_key(kind, kwargs):
+    """차트 요청 (종류, 키워드 인자)의 캐시 키 — 기본값을 채운 뒤 계산"""
+    bound = inspect.signature(CHART_RENDERERS[kind]).bind(**kwargs)
+    bound.apply_defaults()
+    args = bound.arguments
+    if kind == "budget_comparison":
+        data = [args["categories"], args["planned"], args["actual"]]
+    else:
+        data = args["data"]
+    return _chart_key(_CHART_KEY_KINDS.get(kind, kind), data, args["title"])
+
+
+def render_chart_png(kind, kwargs):
+    """차트 하나를 그려 PNG 바이트로 반환"""
+    return CHART_RENDERERS[kind](output_path=io.BytesIO(), **kwargs).getvalue()
+
+
+def _render_chart_timed(kind, kwargs):
+    """render_chart_png + 소요 시간 (초)"""
+    start = time.perf_counter()
+    png = render_chart_png(kind, kwargs)
+    return png, time.perf_counter() - start
+
+
+def render_charts(requests, timings=None):
+    """여러 차트를 한꺼번에 렌더링합니다.
+
+    캐시에 있는 차트는 그대로 쓰고, 나머지는 현재 프로세스에서 순서대로 그립니다.
+    (보고서 한 건의 차트는 최대 4개라 spawn 프로세스 풀은 matplotlib·폰트 준비 비용 때문에
+    순차보다 느렸음 — 일괄 생성은 batch_generate가 보고서 단위로 병렬 처리)
+
+    Args:
+        requests: {이름: (종류, 키워드 인자 dict)} — 종류는 CHART_RENDERERS의 키
+        timings: 주면 {이름: (소요 초, "캐시"|"순차")}를 채움
+
+    Returns:
+        {이름: PNG bytes}
+    """
+    results = {}
+    for name, (kind, kwargs) in requests.items():
+        key = chart_request_key(kind, kwargs)
+        png = _chart_cache.get(key)
+        if png is not None:
+            results[name] = png
+            if timings is not None:
+                timings[name] = (0.0, "캐시")
+            continue
+        results[name], seconds = _render_chart_timed(kind, kwargs)
+        if timings is not None:
+            timings[name] = (seconds, "순차")
+
+    return results
+
+
 # ──────────────────────────────────────────────
 # 테스트용
 # ──────────────────────────────────────────────
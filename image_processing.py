@@ -0,0 +1,303 @@
+"""
+보고서 이미지 전처리 모듈
+- 업로드된 원본(카메라 해상도)을 보고서에 표시되는 최대 크기 × 목표 DPI로 축소
+- EXIF 제거 (회전 정보는 픽셀에 먼저 반영)
+- 사진은 JPEG, 투명도·적은 색상(도면·그래픽)은 PNG로 재압축
+- 스레드 풀로 병렬 처리, 원본 내용 해시 기준으로 결과 캐시
+  (디스크 캐시는 용량·보관 기간 상한을 넘으면 오래 쓰지 않은 파일부터 정리)
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from styles import ImageSize
+
+
+# ──────────────────────────────────────────────
+# 설정
+# ──────────────────────────────────────────────
+
+TARGET_DPI = 200             # 인쇄 품질 기준 해상도
+JPEG_QUALITY = 85
+PNG_MAX_COLORS = 256         # 이 이하의 색상 수면 도면·그래픽으로 보고 PNG 유지
+MAX_WORKERS = 4
+
+# 단독 배치(add_image) 기준 최대 표시 크기 — 그리드·포스터는 이보다 작게 표시됨
+DISPLAY_MAX_WIDTH = ImageSize.SINGLE_MAX_WIDTH
+DISPLAY_MAX_HEIGHT = ImageSize.SINGLE_MAX_HEIGHT
+
+CACHE_MAX_ENTRIES = 1024  # 메모리에 기억할 (해시 → 처리 결과 경로) 수
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "exhibition_report_images")
+CACHE_DIR_MAX_BYTES = 256 * 1024 * 1024    # 디스크 캐시 최대 용량
+CACHE_MAX_AGE_SECONDS = 24 * 60 * 60       # 이 시간 동안 쓰지 않은 처리 결과는 삭제
+CACHE_MIN_KEEP_SECONDS = 10 * 60           # 최근에 쓴 파일은 용량 초과여도 유지 (생성 중인 보고서 보호)
+CACHE_PRUNE_INTERVAL_SECONDS = 5 * 60      # 정리 주기
+
+
+# ──────────────────────────────────────────────
+# 단일 이미지 처리
+# ──────────────────────────────────────────────
+
+def _emu_to_px(length, dpi):
+    return max(1, int(round(length / 914400 * dpi)))
+
+
+def _has_alpha(img):
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def _is_graphic(img):
+    """도면·다이어그램처럼 색상이 적은 이미지인지 (PNG가 더 작고 선명)"""
+    if img.mode in ("1", "P"):
+        return True
+    sample = img.convert("RGB")
+    sample.thumbnail((256, 256))
+    return sample.getcolors(PNG_MAX_COLORS) is not None
+
+
+def optimize_image(data, max_width=DISPLAY_MAX_WIDTH, max_height=DISPLAY_MAX_HEIGHT,
+                   dpi=TARGET_DPI):
+    """
+    이미지 bytes를 표시 크기에 맞게 축소·재압축합니다.
+
+    styles._calc_constrained_size와 같은 규칙(최대 너비, 세로형은 최대 높이)으로
+    표시 크기를 정하고, 그 크기를 dpi로 환산한 픽셀 수까지만 줄입니다.
+    가로세로 비율은 유지되므로 문서 배치는 바뀌지 않습니다.
+
+    Returns:
+        (bytes, 확장자) — 처리할 수 없는 형식이면 원본 그대로 (data, None)
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            src_format = src.format
+            has_exif = "exif" in src.info
+            img = ImageOps.exif_transpose(src)
+            img.load()
+    except Exception:
+        return data, None
+
+    # 표시 크기 (EMU) → 목표 픽셀
+    w, h = img.size
+    display_w = max_width
+    if max_height and h > w:
+        display_w = min(display_w, int(max_height * w / h))
+    target_w = _emu_to_px(display_w, dpi)
+    if w > target_w:
+        img = img.resize((target_w, max(1, round(h * target_w / w))), Image.LANCZOS)
+
+    out = io.BytesIO()
+    if _has_alpha(img) or _is_graphic(img):
+        if img.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            img = img.convert("RGBA" if _has_alpha(img) else "RGB")
+        img.save(out, format="PNG", optimize=True)
+        ext = "png"
+    else:
+        img.convert("RGB").save(out, format="JPEG", quality=JPEG_QUALITY,
+                                optimize=True, progressive=True)
+        ext = "jpg"
+
+    result = out.getvalue()
+    # 이미 작고 EXIF도 없는 원본이 더 작으면 원본 유지
+    if len(result) >= len(data) and w <= target_w and not has_exif \
+            and src_format in ("PNG", "JPEG"):
+        return data, "png" if src_format == "PNG" else "jpg"
+    return result, ext
+
+
+# ──────────────────────────────────────────────
+# 캐시 + 병렬 처리
+# ──────────────────────────────────────────────
+
+class ImagePreprocessor:
+    """원본 내용 해시 → 처리 결과 캐시를 가진 병렬 이미지 전처리기
+
+    처리 결과는 CACHE_DIR/<해시>_<dpi>.<확장자>로 저장하여 기존 경로 기반 코드
+    (os.path.exists, add_image 등)에서 그대로 쓸 수 있게 합니다.
+    같은 내용은 같은 파일이므로 여러 세션이 동시에 써도 안전합니다.
+
+    디스크 캐시는 파일 수정 시각(캐시 적중 시 갱신)을 마지막 사용 시각으로 보고,
+    max_age_seconds가 지난 파일과 max_bytes를 넘는 만큼의 오래된 파일을 주기적으로 지웁니다.
+    최근 min_keep_seconds 안에 쓴 파일은 생성 중인 보고서가 읽을 수 있으므로 지우지 않습니다.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=MAX_WORKERS, dpi=TARGET_DPI,
+                 max_bytes=CACHE_DIR_MAX_BYTES, max_age_seconds=CACHE_MAX_AGE_SECONDS,
+                 min_keep_seconds=CACHE_MIN_KEEP_SECONDS,
+                 prune_interval=CACHE_PRUNE_INTERVAL_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.dpi = dpi
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.min_keep_seconds = min_keep_seconds
+        self.prune_interval = prune_interval
+        self._paths = OrderedDict()  # (원본 해시, dpi) → 처리된 파일 경로
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def process_file(self, path):
+        """원본 경로 → 처리된 이미지 경로 (실패하면 원본 경로)"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return path
+
+        key = (hashlib.sha256(data).hexdigest(), self.dpi)
+        with self._lock:
+            cached = self._paths.get(key)
+            if cached is not None and _touch(cached):
+                self._paths.move_to_end(key)
+                return cached
+
+        result, ext = optimize_image(data, dpi=self.dpi)
+        if ext is None:
+            return path
+
+        out_path = os.path.join(self.cache_dir, f"{key[0]}_{self.dpi}.{ext}")
+        if not _touch(out_path):
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(result)
+                os.replace(tmp_path, out_path)
+            except OSError:
+                return path
+
+        with self._lock:
+            self._paths[key] = out_path
+            while len(self._paths) > CACHE_MAX_ENTRIES:
+                self._paths.popitem(last=False)
+        self.maybe_prune()
+        return out_path
+
+    def maybe_prune(self):
+        """마지막 정리 후 prune_interval이 지났으면 정리"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = now
+        self.prune(now)
+
+    def prune(self, now=None):
+        """
+        디스크 캐시 정리: 오래 쓰지 않은 파일을 지우고, 남은 용량이 max_bytes를 넘으면
+        마지막 사용이 오래된 파일부터 지웁니다 (min_keep_seconds 이내에 쓴 파일은 제외).
+
+        Returns:
+            삭제한 파일 수
+        """
+        now = now or time.time()
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+
+        entries = []
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()  # 오래된 것부터
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            idle = now - mtime
+            if idle <= self.min_keep_seconds:
+                break
+            if idle <= self.max_age_seconds and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def process_many(self, paths):
+        """여러 경로를 스레드 풀에서 동시에 처리 → {원본 경로: 처리된 경로}"""
+        unique = [p for p in dict.fromkeys(paths) if p and os.path.exists(p)]
+        if not unique:
+            return {}
+        if len(unique) == 1 or self.max_workers <= 1:
+            return {p: self.process_file(p) for p in unique}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as pool:
+            return dict(zip(unique, pool.map(self.process_file, unique)))
+
+
+def _touch(path):
+    """파일의 마지막 사용 시각 갱신 (정리 기준). 파일이 없으면 False."""
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+
+_preprocessor = ImagePreprocessor()
+
+
+def get_image_preprocessor():
+    """프로세스 전역 이미지 전처리기"""
+    return _preprocessor
+
+
+def configure_image_cache(cache_dir):
+    """처리 결과 디스크 캐시 디렉토리 변경 (메모리에 기억한 경로도 비움)"""
+    with _preprocessor._lock:
+        _preprocessor.cache_dir = cache_dir
+        _preprocessor._paths.clear()
+
+
+def preprocess_report_images(data):
+    """
+    보고서 데이터 dict 안의 모든 이미지 경로를 전처리된 경로로 바꾼 사본을 반환합니다.
+
+    대상: poster_image, rooms[].floor_plan / photos, program_photos,
+          material_photos, promotion_photos
+    """
+    data = dict(data)
+    rooms = [dict(room) for room in data.get("rooms", [])]
+
+    paths = [data.get("poster_image")]
+    for room in rooms:
+        paths.append(room.get("floor_plan"))
+        paths.extend(room.get("photos", []))
+    for key in ("program_photos", "material_photos", "promotion_photos"):
+        paths.extend(data.get(key, []))
+
+    mapping = _preprocessor.process_many(paths)
+    if not mapping:
+        return data
+
+    def swap(p):
+        return mapping.get(p, p) if p else p
+
+    if data.get("poster_image"):
+        data["poster_image"] = swap(data["poster_image"])
+    for room in rooms:
+        if room.get("floor_plan"):
+            room["floor_plan"] = swap(room["floor_plan"])
+        if room.get("photos"):
+            room["photos"] = [swap(p) for p in room["photos"]]
+    if "rooms" in data:
+        data["rooms"] = rooms
+    for key in ("program_photos", "material_photos", "promotion_photos"):
+        if data.get(key):
+            data[key] = [swap(p) for p in data[key]]
+    return data
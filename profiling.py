@@ -0,0 +1,149 @@
+"""
+보고서 생성 단계별 소요 시간 측정
+- 섹션 메서드, 차트 렌더링, 이미지 삽입, 문서 저장 등 단계별 시간을 기록
+- 현재 생성 중인 보고서의 기록기는 ContextVar로 전달되므로
+  styles 같은 하위 모듈에서도 인자 추가 없이 단계를 기록할 수 있음
+- 선택적으로 cProfile 결과(누적 시간 상위 함수)를 함께 수집
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+CPROFILE_TOP_N = 30  # cProfile 결과에서 보여줄 함수 수
+
+# 단계 분류 (표시 순서)
+CATEGORY_LABELS = {
+    "prepare": "준비",
+    "chart": "차트 렌더링",
+    "image": "이미지 삽입",
+    "section": "섹션 작성",
+    "save": "문서 저장",
+}
+
+
+# ──────────────────────────────────────────────
+# 데이터 구조
+# ──────────────────────────────────────────────
+
+@dataclass
+class StageTiming:
+    """단계 하나의 소요 시간"""
+    name: str
+    category: str
+    seconds: float
+    detail: str = ""
+
+
+@dataclass
+class GenerationProfile:
+    """보고서 한 건의 단계별 소요 시간 기록
+
+    섹션 단계 시간에는 그 안에서 일어난 이미지 삽입 시간이 포함됩니다.
+    차트는 섹션 작성 전에 한꺼번에 렌더링되며, 캐시에서 가져온 차트는 0초로 기록됩니다.
+    """
+    stages: list = field(default_factory=list)
+    total_seconds: float = 0.0
+    cprofile_stats: Optional[str] = None
+
+    def add(self, name, category, seconds, detail=""):
+        self.stages.append(StageTiming(name, category, seconds, detail))
+
+    @contextmanager
+    def stage(self, name, category, detail=""):
+        """with 블록의 소요 시간을 단계로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, time.perf_counter() - start, detail)
+
+    def by_category(self):
+        """{분류: (건수, 합계 초)} — CATEGORY_LABELS 순서"""
+        totals = {}
+        for s in self.stages:
+            count, seconds = totals.get(s.category, (0, 0.0))
+            totals[s.category] = (count + 1, seconds + s.seconds)
+        order = list(CATEGORY_LABELS)
+        return dict(sorted(totals.items(),
+                           key=lambda kv: order.index(kv[0]) if kv[0] in order else len(order)))
+
+    def slowest(self, n=10):
+        return sorted(self.stages, key=lambda s: s.seconds, reverse=True)[:n]
+
+    def to_dict(self):
+        return {
+            "total_seconds": self.total_seconds,
+            "by_category": {
+                cat: {"count": count, "seconds": seconds}
+                for cat, (count, seconds) in self.by_category().items()
+            },
+            "stages": [asdict(s) for s in self.stages],
+            "cprofile_stats": self.cprofile_stats,
+        }
+
+    def format_text(self, top_n=10):
+        """로그·콘솔용 요약 텍스트"""
+        lines = [f"보고서 생성 {self.total_seconds:.3f}초"]
+        for cat, (count, seconds) in self.by_category().items():
+            lines.append(f"  {CATEGORY_LABELS.get(cat, cat)}: {seconds:.3f}초 ({count}건)")
+        lines.append(f"  느린 단계 상위 {top_n}:")
+        for s in self.slowest(top_n):
+            detail = f" [{s.detail}]" if s.detail else ""
+            lines.append(f"    {s.seconds:8.3f}초  {s.category:<8} {s.name}{detail}")
+        return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────
+# 현재 기록기 (ContextVar)
+# ──────────────────────────────────────────────
+
+_active_profile = ContextVar("active_generation_profile", default=None)
+
+
+@contextmanager
+def activate(profile):
+    """with 블록 동안 stage()가 profile에 기록하도록 설정"""
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+@contextmanager
+def stage(name, category, detail=""):
+    """현재 기록기에 단계 기록 (기록 중이 아니면 아무것도 하지 않음)"""
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name, category, detail):
+        yield
+
+
+# ──────────────────────────────────────────────
+# cProfile
+# ──────────────────────────────────────────────
+
+@contextmanager
+def capture_cprofile(profile, top_n=CPROFILE_TOP_N):
+    """with 블록을 cProfile로 측정하여 누적 시간 상위 함수를 profile.cprofile_stats에 저장"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top_n)
+        profile.cprofile_stats = out.getvalue()
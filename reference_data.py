@@ -3,13 +3,20 @@
 - Excel 파일에서 과거 전시 데이터 로드
 - 통계 계산 (평균, 중앙값, 백분위 등)
 - 유사 전시 검색
+- 기간별(최근 N년·역대) 통계
 - 새 전시 데이터 추가/저장
 """
 
 import os
+import re
+import hashlib
+import pickle
+import threading
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import reference_store
 
 
 # ──────────────────────────────────────────────
@@ -39,6 +46,21 @@ NUMERIC_COLUMNS = [
     "멤버십 회원수", "멤버십 증가율",
 ]
 
+# 파싱 결과 사이드카 캐시 (xlsx 옆에 저장, mtime + 내용 해시로 검증)
+REFERENCE_CACHE_SUFFIX = ".cache"
+REFERENCE_CACHE_FORMAT = 2  # 캐시 구조/정제 로직 변경 시 올려서 기존 캐시 무효화 (2: 파생 지표 포함)
+
+# compute_derived_metrics가 추가하는 파생 지표 컬럼
+DERIVED_METRIC_COLUMNS = [
+    "관객당_비용", "수입_예산_비율", "유료_비율", "프로그램_참여율", "보도건당_관객",
+]
+DERIVED_SOURCE_COLUMNS = [
+    "총 사용 예산", "총 관객수", "총수입", "유료 관객수", "프로그램 참여 인원", "언론 보도 건수",
+]
+# 파생 지표가 계산되어 있음을 표시하는 DataFrame.attrs 키
+# (load_reference가 레퍼런스 버전당 한 번 계산 — 레퍼런스가 바뀌면 버전과 함께 다시 계산됨)
+DERIVED_METRICS_ATTR = "derived_metrics"
+
 # 유사 전시 검색에 사용할 핵심 비교 필드 및 가중치
 SIMILARITY_FIELDS = {
     "총 사용 예산": 0.35,
@@ -52,7 +74,7 @@ SIMILARITY_FIELDS = {
 # Excel 로드
 # ──────────────────────────────────────────────
 
-def load_reference(xlsx_path: str) -> pd.DataFrame:
+def load_reference(xlsx_path: str, use_cache: bool = True) -> pd.DataFrame:
     """
     레퍼런스 Excel 파일을 DataFrame으로 로드.
 
@@ -61,12 +83,56 @@ def load_reference(xlsx_path: str) -> pd.DataFrame:
         Row 2: 실제 컬럼명
         Row 3+: 전시 데이터
 
+    파싱·정제된 결과는 xlsx 옆의 사이드카 캐시(`*.xlsx.cache`)에 저장되며,
+    xlsx의 mtime 또는 내용 해시가 그대로이면 openpyxl 파싱 없이 캐시를 읽습니다.
+
+    경로가 SQLite 레퍼런스 저장소(*.db 등)이면 저장소에서 읽습니다
+    (reference_store.load_store_frame — 마지막으로 읽은 뒤 추가된 행만 읽음).
+
+    Args:
+        xlsx_path: Excel 파일 또는 레퍼런스 저장소 경로
+        use_cache: False이면 캐시를 무시하고 항상 Excel을 파싱
+
     Returns:
         pd.DataFrame: 전시별 한 행, 컬럼명은 Row 2 기준
     """
     if not os.path.exists(xlsx_path):
         raise FileNotFoundError(f"레퍼런스 파일을 찾을 수 없습니다: {xlsx_path}")
 
+    if reference_store.is_store_path(xlsx_path):
+        return reference_store.load_store_frame(xlsx_path)
+
+    if not use_cache:
+        return _materialize_derived_metrics(_parse_reference_xlsx(xlsx_path))
+
+    cache_path = xlsx_path + REFERENCE_CACHE_SUFFIX
+    file_stat = os.stat(xlsx_path)
+    cached = _read_reference_cache(cache_path)
+
+    # 1차: mtime/크기가 같으면 해시 계산 없이 바로 사용
+    if cached and cached["mtime_ns"] == file_stat.st_mtime_ns and cached["size"] == file_stat.st_size:
+        return _with_version(cached["frame"], cached["sha256"])
+
+    # 2차: mtime만 바뀐 경우(복사, 체크아웃 등) 내용 해시로 확인
+    digest = _file_sha256(xlsx_path)
+    if cached and cached["sha256"] == digest:
+        df = cached["frame"]
+    else:
+        # 파생 지표는 파싱 직후 한 번 계산하여 캐시에 함께 저장
+        df = _materialize_derived_metrics(_parse_reference_xlsx(xlsx_path))
+
+    _write_reference_cache(cache_path, {
+        "format": REFERENCE_CACHE_FORMAT,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "size": file_stat.st_size,
+        "sha256": digest,
+        "frame": df,
+    })
+    return _with_version(df, digest)
+
+
+def _parse_reference_xlsx(xlsx_path: str) -> pd.DataFrame:
+    """openpyxl로 Excel을 파싱하고 숫자 컬럼을 정제합니다."""
     # Row 1(0-indexed) = 컬럼명, skiprows=[0]으로 카테고리 헤더 건너뜀
     df = pd.read_excel(
         xlsx_path,
@@ -101,6 +167,61 @@ def load_reference(xlsx_path: str) -> pd.DataFrame:
     return df
 
 
+def _file_sha256(path: str) -> str:
+    """파일 내용의 SHA-256 해시"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _with_version(df: pd.DataFrame, digest: str) -> pd.DataFrame:
+    """
+    레퍼런스 버전(내용 해시)을 DataFrame 메타데이터에 기록.
+
+    pandas는 attrs를 행 부분집합·슬라이스·복사본에도 그대로 물려주므로,
+    버전과 함께 행 지문을 기록해 두고 get_reference_version에서 대조합니다.
+    """
+    df.attrs["reference_version"] = digest[:16]
+    df.attrs["reference_rows"] = _row_fingerprint(df)
+    return df
+
+
+def _row_fingerprint(df: pd.DataFrame) -> str:
+    """행 구성(행 수 + 인덱스 값)의 지문 — 부분집합·재정렬이면 달라짐"""
+    hashed = pd.util.hash_pandas_object(df.index, index=False).to_numpy()
+    return f"{len(df)}:{hashlib.blake2b(hashed.tobytes(), digest_size=8).hexdigest()}"
+
+
+def _read_reference_cache(cache_path: str) -> dict | None:
+    """사이드카 캐시 읽기. 없거나 손상·구버전이면 None."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(cached, dict) or cached.get("format") != REFERENCE_CACHE_FORMAT:
+        return None
+    return cached
+
+
+def _write_reference_cache(cache_path: str, payload: dict):
+    """사이드카 캐시를 원자적으로 기록. 쓰기 실패는 무시 (캐시는 선택 사항)."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 # ──────────────────────────────────────────────
 # 통계 계산
 # ──────────────────────────────────────────────
@@ -119,6 +240,7 @@ class FieldStats:
     q75: float          # 75th percentile
     values: list        # 전체 유효 값 리스트 (순위 계산용)
     titles: list        # 대응하는 전시 제목 리스트
+    sorted_values: np.ndarray | None = field(default=None, repr=False)  # 오름차순 정렬본 (이진 탐색용)
 
 
 def compute_stats(df: pd.DataFrame, column: str) -> FieldStats | None:
@@ -134,42 +256,99 @@ def compute_stats(df: pd.DataFrame, column: str) -> FieldStats | None:
     """
     if column not in df.columns:
         return None
+    values = df[column].to_numpy(dtype=float, na_value=np.nan)
+    return _field_stats_from_array(column, values, df["전시 제목"].to_numpy())
+
 
-    series = df[column].dropna()
-    if len(series) < 2:
+def _field_stats_from_array(column: str, values: np.ndarray, titles: np.ndarray) -> FieldStats | None:
+    """NaN이 섞인 값 배열에서 FieldStats 생성 (compute_stats / ReferenceStatsIndex 공용)"""
+    valid_mask = ~np.isnan(values)
+    valid = values[valid_mask]
+    if len(valid) < 2:
         return None
 
-    # 유효 값과 대응하는 전시 제목
-    valid_mask = df[column].notna()
-    values = df.loc[valid_mask, column].tolist()
-    titles = df.loc[valid_mask, "전시 제목"].tolist()
+    sorted_vals = np.sort(valid)
+    q25, median, q75 = np.quantile(sorted_vals, [0.25, 0.5, 0.75])
 
     return FieldStats(
         field_name=column,
-        count=len(series),
-        mean=float(series.mean()),
-        median=float(series.median()),
-        min_val=float(series.min()),
-        max_val=float(series.max()),
-        std=float(series.std()),
-        q25=float(series.quantile(0.25)),
-        q75=float(series.quantile(0.75)),
-        values=values,
-        titles=titles,
+        count=len(valid),
+        mean=float(valid.mean()),
+        median=float(median),
+        min_val=float(sorted_vals[0]),
+        max_val=float(sorted_vals[-1]),
+        std=float(valid.std(ddof=1)),
+        q25=float(q25),
+        q75=float(q75),
+        values=valid.tolist(),
+        titles=titles[valid_mask].tolist(),
+        sorted_values=sorted_vals,
     )
 
 
+# 순위 계산 시 같은 값으로 간주하는 허용 오차
+RANK_TIE_TOLERANCE = 0.01
+
+
+def _sorted_array(stats: FieldStats) -> np.ndarray:
+    """FieldStats의 오름차순 정렬 배열 (직접 생성된 FieldStats는 즉석 정렬)"""
+    if stats.sorted_values is None:
+        stats.sorted_values = np.sort(np.asarray(stats.values, dtype=float))
+    return stats.sorted_values
+
+
+def _percentiles(sorted_vals: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """값보다 작은 개수 + 같은 개수의 절반을 백분위로 환산 (NaN은 0)"""
+    below = np.searchsorted(sorted_vals, values, side="left")
+    equal = np.searchsorted(sorted_vals, values, side="right") - below
+    percentile = (below + equal * 0.5) / len(sorted_vals) * 100
+    percentile = np.where(np.isnan(values), 0.0, percentile)
+    return np.rint(percentile).astype(int)
+
+
+def _count_diff_within(sorted_vals: np.ndarray, values: np.ndarray,
+                       threshold: float, inclusive: bool) -> np.ndarray:
+    """
+    각 값 x에 대해 (v - x) < threshold (inclusive면 <=) 인 원소 개수.
+
+    이진 탐색으로 경계를 찾고, 경계 바로 근처의 원소만 원래 뺄셈식으로 다시 비교해
+    부동소수점 반올림까지 기존 비교 결과와 일치시킵니다.
+    """
+    cut = values + threshold
+    width = (np.abs(values) + abs(threshold)) * 1e-12
+    lo = np.searchsorted(sorted_vals, cut - width, side="left")
+    hi = np.searchsorted(sorted_vals, cut + width, side="right")
+    counts = lo.copy()
+    for i in np.flatnonzero(hi > lo):
+        diffs = sorted_vals[lo[i]:hi[i]] - values[i]
+        hit = diffs <= threshold if inclusive else diffs < threshold
+        counts[i] += int(np.count_nonzero(hit))
+    return counts
+
+
+def _ranks(sorted_vals: np.ndarray, values: np.ndarray, ascending: bool) -> np.ndarray:
+    """
+    순위 계산. 허용 오차 이내의 값은 동률로 보고 그중 가장 좋은 순위를 부여.
+    (동률이 없으면 삽입 위치 기준 순위와 같음, NaN은 최하위 다음)
+    """
+    n = len(sorted_vals)
+    if ascending:
+        # 확실히 더 작은 값(v - x <= -오차)의 개수 + 1
+        ranks = _count_diff_within(sorted_vals, values, -RANK_TIE_TOLERANCE, inclusive=True) + 1
+    else:
+        # 확실히 더 큰 값(v - x >= 오차)의 개수 + 1
+        ranks = n - _count_diff_within(sorted_vals, values, RANK_TIE_TOLERANCE, inclusive=False) + 1
+    return np.where(np.isnan(values), n + 1, ranks)
+
+
 def compute_percentile(stats: FieldStats, value: float) -> int:
     """
     주어진 값의 백분위를 계산합니다 (0-100).
     """
     if stats is None or stats.count == 0:
         return 50
-    sorted_vals = sorted(stats.values)
-    below = sum(1 for v in sorted_vals if v < value)
-    equal = sum(1 for v in sorted_vals if v == value)
-    percentile = (below + equal * 0.5) / len(sorted_vals) * 100
-    return int(round(percentile))
+    values = np.array([value], dtype=float)
+    return int(_percentiles(_sorted_array(stats), values)[0])
 
 
 def compute_rank(stats: FieldStats, value: float, ascending: bool = False) -> int:
@@ -181,29 +360,255 @@ def compute_rank(stats: FieldStats, value: float, ascending: bool = False) -> in
     """
     if stats is None or stats.count == 0:
         return 0
-    if ascending:
-        sorted_vals = sorted(stats.values)
-    else:
-        sorted_vals = sorted(stats.values, reverse=True)
-    # 같은 값이면 가장 좋은 순위
-    for i, v in enumerate(sorted_vals):
-        if abs(v - value) < 0.01 or v == value:
-            return i + 1
-    # 값이 리스트에 없으면 삽입 위치 기준
-    for i, v in enumerate(sorted_vals):
-        if (not ascending and value > v) or (ascending and value < v):
-            return i + 1
-    return len(sorted_vals) + 1
+    values = np.array([value], dtype=float)
+    return int(_ranks(_sorted_array(stats), values, ascending)[0])
+
+
+def compute_percentiles_and_ranks(
+    stats: FieldStats, values, ascending: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    여러 값의 백분위와 순위를 한 번에 계산합니다.
+    compute_percentile / compute_rank를 값마다 호출한 것과 같은 결과입니다.
+
+    Returns:
+        (백분위 배열, 순위 배열)
+    """
+    values = np.asarray(values, dtype=float)
+    if stats is None or stats.count == 0:
+        return np.full(values.shape, 50), np.zeros(values.shape, dtype=int)
+    sorted_vals = _sorted_array(stats)
+    return _percentiles(sorted_vals, values), _ranks(sorted_vals, values, ascending)
+
+
+# ──────────────────────────────────────────────
+# 필드별 통계 인덱스
+# ──────────────────────────────────────────────
+
+class ReferenceStatsIndex:
+    """
+    (레퍼런스 DataFrame, 전시 유형) 쌍마다 한 번 만드는 필드별 통계 인덱스.
+
+    NUMERIC_COLUMNS와 파생 지표 컬럼의 FieldStats를 미리 계산해 두어,
+    여러 분석 함수가 같은 컬럼을 조회해도 dropna/평균/분위수를 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list | None = None):
+        if columns is None:
+            columns = NUMERIC_COLUMNS + DERIVED_METRIC_COLUMNS
+        columns = [c for c in columns if c in df.columns]
+
+        self.row_count = len(df)
+        self._stats: dict[str, FieldStats | None] = {}
+        if not columns:
+            return
+
+        matrix = df[columns].to_numpy(dtype=float, na_value=np.nan)
+        titles = df["전시 제목"].to_numpy()
+        for i, col in enumerate(columns):
+            self._stats[col] = _field_stats_from_array(col, matrix[:, i], titles)
+
+    def get(self, column: str) -> FieldStats | None:
+        """compute_stats(df, column)과 같은 결과를 O(1)로 반환"""
+        return self._stats.get(column)
+
+    def __contains__(self, column: str) -> bool:
+        return self._stats.get(column) is not None
+
+
+_STATS_INDEX_CACHE: dict = {}
+_STATS_INDEX_CACHE_SIZE = 16
+
+
+def get_stats_index(df: pd.DataFrame, cache_key=None) -> ReferenceStatsIndex:
+    """
+    통계 인덱스를 반환합니다. cache_key가 주어지면 같은 키로 재사용합니다.
+
+    Args:
+        df: 통계를 낼 (유형 필터링·파생 지표 계산이 끝난) DataFrame
+        cache_key: 예) (get_reference_version(ref_df), exhibition_type).
+            None이면 캐시 없이 새로 생성.
+    """
+    if cache_key is None:
+        return ReferenceStatsIndex(df)
+    return _get_or_build(_STATS_INDEX_CACHE, cache_key, lambda: ReferenceStatsIndex(df))
+
+
+def _get_or_build(cache: dict, key, build, max_size: int = _STATS_INDEX_CACHE_SIZE):
+    """키가 있으면 재사용, 없으면 생성 후 저장 (가장 오래된 항목부터 제거)"""
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        if len(cache) >= max_size:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+    return value
+
+
+def get_reference_version(df: pd.DataFrame) -> str | None:
+    """
+    load_reference가 기록한 레퍼런스 버전(내용 해시). 알 수 없으면 None.
+
+    버전 표시를 물려받은 행 부분집합·슬라이스는 버전이 기록된 프레임과 행이 다르므로 None
+    (전체 프레임 기준의 캐시를 부분집합에 재사용하지 않도록).
+    """
+    version = df.attrs.get("reference_version")
+    if version is None or df.attrs.get("reference_rows") != _row_fingerprint(df):
+        return None
+    return version
 
 
 # ──────────────────────────────────────────────
 # 유사 전시 검색
 # ──────────────────────────────────────────────
 
+class SimilarityIndex:
+    """
+    유사 전시 검색용 정규화 특징 행렬.
+
+    SIMILARITY_FIELDS의 값 행렬, 필드별 유효값(NaN·0 제외) 범위와 가중치를
+    한 번만 계산해 두고, 질의는 행렬 연산 + np.argpartition으로 처리합니다.
+    여러 전시를 한꺼번에 질의하거나(query_batch), 과거 전시 전체를 서로 비교(backtest)할 수 있습니다.
+    """
+
+    QUERY_CHUNK = 256  # 배치 질의 시 한 번에 계산할 질의 수 (메모리 상한)
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.fields = [f for f in SIMILARITY_FIELDS if f in df.columns]
+        self.weights = np.array([SIMILARITY_FIELDS[f] for f in self.fields], dtype=float)
+
+        if self.fields:
+            self.matrix = df[self.fields].to_numpy(dtype=float, na_value=np.nan)
+        else:
+            self.matrix = np.empty((len(df), 0))
+
+        # 필드별 범위: NaN과 0을 제외한 값 기준, 유효값 2개 미만이거나 범위 0이면 비교에서 제외
+        valid = ~np.isnan(self.matrix) & (self.matrix != 0)
+        self.ranges = np.zeros(len(self.fields))
+        for j in range(len(self.fields)):
+            col = self.matrix[valid[:, j], j]
+            if len(col) >= 2:
+                self.ranges[j] = col.max() - col.min()
+        self.usable = self.ranges > 0
+
+    def _vectorize(self, current: dict) -> tuple[np.ndarray, np.ndarray]:
+        """현재 전시 dict → (값 벡터, 사용 여부 마스크). None·누락·0인 필드는 제외."""
+        values = np.full(len(self.fields), np.nan)
+        active = np.zeros(len(self.fields), dtype=bool)
+        for j, f in enumerate(self.fields):
+            v = current.get(f)
+            if v is None:
+                continue
+            v = float(v)
+            if v == 0:
+                continue
+            values[j] = v
+            active[j] = True
+        return values, active
+
+    def _scores(self, values: np.ndarray, active: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        질의 (m, f)에 대한 가중 정규화 차이 (m, n)와 질의별 총 가중치 (m,).
+        데이터가 없는 칸은 최대 차이(1)로 간주합니다.
+        """
+        active = active & self.usable
+        ranges = np.where(self.usable, self.ranges, 1.0)
+        with np.errstate(invalid="ignore"):
+            diff = np.abs(self.matrix[None, :, :] - values[:, None, :]) / ranges
+        diff = np.where(np.isnan(diff), 1.0, np.minimum(diff, 1.0))
+        weights = np.where(active, self.weights, 0.0)
+
+        # 필드 순서대로 누적 (get_similar_exhibitions의 기존 합산 순서와 동일하게 유지)
+        scores = np.zeros(diff.shape[:2])
+        total_weight = np.zeros(len(values))
+        for j in range(len(self.fields)):
+            scores += diff[:, :, j] * weights[:, j, None]
+            total_weight += weights[:, j]
+        return scores, total_weight
+
+    @staticmethod
+    def _top_n(similarity: np.ndarray, top_n: int) -> np.ndarray:
+        """유사도 내림차순 상위 top_n 행 위치 (동점이면 원래 순서 유지)"""
+        n = len(similarity)
+        if top_n <= 0:
+            return np.empty(0, dtype=int)
+        if top_n >= n:
+            return np.argsort(-similarity, kind="stable")
+        part = np.argpartition(-similarity, top_n - 1)[:top_n]
+        candidates = np.flatnonzero(similarity >= similarity[part].min())
+        order = candidates[np.argsort(-similarity[candidates], kind="stable")]
+        return order[:top_n]
+
+    def _rank_queries(self, values, active, top_n, exclude=None):
+        results = []
+        for start in range(0, len(values), self.QUERY_CHUNK):
+            stop = start + self.QUERY_CHUNK
+            scores, total_weight = self._scores(values[start:stop], active[start:stop])
+            for i in range(len(scores)):
+                if total_weight[i] == 0:
+                    # 비교할 필드가 없으면 원래 순서대로 (제외 대상은 빼고)
+                    positions = np.arange(len(self.df))
+                    if exclude is not None:
+                        positions = positions[positions != exclude[start + i]]
+                    results.append((positions[:max(top_n, 0)], None))
+                    continue
+                similarity = 1 - scores[i] / total_weight[i]
+                if exclude is not None:
+                    similarity[exclude[start + i]] = -np.inf
+                positions = self._top_n(similarity, top_n)
+                if exclude is not None:
+                    # top_n이 전체 행 수 이상이면 제외한 행이 맨 뒤에 남으므로 제거
+                    positions = positions[np.isfinite(similarity[positions])]
+                results.append((positions, similarity[positions]))
+        return results
+
+    def _to_frame(self, positions, similarity) -> pd.DataFrame:
+        result = self.df.iloc[positions].copy()
+        if similarity is not None:
+            result["_similarity_score"] = similarity
+        return result
+
+    def query(self, current: dict, top_n: int = 5) -> pd.DataFrame:
+        """get_similar_exhibitions와 같은 결과 (상위 top_n행만 복사)"""
+        return self.query_batch([current], top_n)[0]
+
+    def query_batch(self, currents: list[dict], top_n: int = 5) -> list[pd.DataFrame]:
+        """여러 전시를 한 번에 질의. 입력 순서대로 결과 DataFrame 리스트 반환."""
+        if self.df.empty:
+            return [pd.DataFrame() for _ in currents]
+        if not currents:
+            return []
+        vectors = [self._vectorize(c) for c in currents]
+        values = np.array([v for v, _ in vectors]).reshape(len(currents), len(self.fields))
+        active = np.array([a for _, a in vectors]).reshape(len(currents), len(self.fields))
+        return [self._to_frame(p, s) for p, s in self._rank_queries(values, active, top_n)]
+
+    def backtest(self, top_n: int = 5) -> list[pd.DataFrame]:
+        """과거 전시 각각을 나머지 전시 전체와 비교 (자기 자신은 제외)."""
+        if self.df.empty:
+            return []
+        values = self.matrix
+        active = ~np.isnan(values) & (values != 0)
+        exclude = np.arange(len(self.df))
+        return [self._to_frame(p, s) for p, s in self._rank_queries(values, active, top_n, exclude)]
+
+
+_SIMILARITY_INDEX_CACHE: dict = {}
+
+
+def get_similarity_index(df: pd.DataFrame, cache_key=None) -> SimilarityIndex:
+    """유사도 인덱스를 반환합니다. cache_key가 주어지면 같은 키로 재사용합니다."""
+    if cache_key is None:
+        return SimilarityIndex(df)
+    return _get_or_build(_SIMILARITY_INDEX_CACHE, cache_key, lambda: SimilarityIndex(df))
+
+
 def get_similar_exhibitions(
     df: pd.DataFrame,
     current: dict,
     top_n: int = 5,
+    index: SimilarityIndex | None = None,
 ) -> pd.DataFrame:
     """
     현재 전시와 유사한 과거 전시를 찾아 반환합니다.
@@ -216,53 +621,16 @@ def get_similar_exhibitions(
         df: 레퍼런스 DataFrame
         current: 현재 전시 데이터 dict (키: 필드명, 값: 숫자)
         top_n: 반환할 유사 전시 수
+        index: df로 미리 만든 SimilarityIndex (없으면 새로 생성)
 
     Returns:
         유사도 순으로 정렬된 DataFrame (상위 top_n개)
     """
     if df.empty:
         return pd.DataFrame()
-
-    scores = pd.Series(0.0, index=df.index)
-    total_weight = 0.0
-
-    for field, weight in SIMILARITY_FIELDS.items():
-        if field not in current or current[field] is None:
-            continue
-        if field not in df.columns:
-            continue
-
-        current_val = float(current[field])
-        if current_val == 0:
-            continue
-
-        col = df[field].copy()
-        valid = col.notna() & (col != 0)
-
-        if valid.sum() < 2:
-            continue
-
-        # 정규화된 차이 계산 (0 = 동일, 1 = 매우 다름)
-        col_range = col[valid].max() - col[valid].min()
-        if col_range == 0:
-            continue
-
-        diff = (col - current_val).abs() / col_range
-        diff = diff.clip(upper=1.0)
-        diff = diff.fillna(1.0)  # 데이터 없으면 최대 차이
-
-        scores += diff * weight
-        total_weight += weight
-
-    if total_weight == 0:
-        return df.head(top_n)
-
-    scores = scores / total_weight  # 0~1 정규화
-    df_result = df.copy()
-    df_result["_similarity_score"] = 1 - scores  # 1에 가까울수록 유사
-    df_result = df_result.sort_values("_similarity_score", ascending=False)
-
-    return df_result.head(top_n)
+    if index is None:
+        index = SimilarityIndex(df)
+    return index.query(current, top_n=top_n)
 
 
 # ──────────────────────────────────────────────
@@ -271,6 +639,7 @@ def get_similar_exhibitions(
 
 EXHIBITION_TYPE_COL = "전시 유형"
 EXCLUDED_TYPE = 0  # 유형 0은 분석에서 제외 (특수 전시)
+MIN_TYPE_ROWS = 3  # 같은 유형이 이보다 적으면 유형 구분 없이 전체와 비교
 
 
 def exclude_type_zero(df: pd.DataFrame) -> pd.DataFrame:
@@ -309,7 +678,7 @@ def filter_by_type(df: pd.DataFrame, exhibition_type) -> pd.DataFrame:
     filtered = df[type_series == target]
 
     # 같은 유형이 3개 미만이면 의미 있는 비교가 어려우므로 전체 사용
-    if len(filtered) < 3:
+    if len(filtered) < MIN_TYPE_ROWS:
         return df
 
     return filtered
@@ -338,6 +707,375 @@ def get_type_count(df: pd.DataFrame, exhibition_type) -> int:
     return int((type_series == target).sum())
 
 
+class TypePartition:
+    """
+    레퍼런스 DataFrame을 전시 유형별로 미리 나눠 둔 뷰.
+
+    유형 컬럼을 한 번만 숫자로 변환하여 유형 0 제외 프레임, 유형별 전시 수,
+    유형별 부분 프레임을 만들어 두므로, filter_by_type / get_type_count /
+    exclude_type_zero를 매번 다시 계산하지 않아도 됩니다.
+    같은 유형이 MIN_TYPE_ROWS개 미만이면 filter_by_type과 같이 전체(유형 0 제외)를 돌려줍니다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.source_count = len(df)
+        self._has_type = EXHIBITION_TYPE_COL in df.columns
+        if not self._has_type:
+            self.all = df
+            self.counts = {}
+            self._views = {}
+            return
+
+        types = pd.to_numeric(df[EXHIBITION_TYPE_COL], errors="coerce")
+        self.all = df[types != EXCLUDED_TYPE]
+        self.counts = {float(t): int(n) for t, n in types.value_counts().items()}
+
+        types_all = types[types != EXCLUDED_TYPE]
+        self._views = {
+            t: self.all[(types_all == t).to_numpy()]
+            for t, n in self.counts.items()
+            if t != EXCLUDED_TYPE and n >= MIN_TYPE_ROWS
+        }
+
+    @property
+    def excluded_count(self) -> int:
+        """유형 0으로 제외된 전시 수"""
+        return self.source_count - len(self.all)
+
+    @property
+    def valid_types(self) -> list:
+        """유형 0을 뺀 유형 값 목록 (오름차순)"""
+        return sorted(t for t in self.counts if t != EXCLUDED_TYPE)
+
+    @staticmethod
+    def _key(exhibition_type):
+        try:
+            return float(exhibition_type)
+        except (ValueError, TypeError):
+            return None
+
+    def filter(self, exhibition_type) -> pd.DataFrame:
+        """filter_by_type(df, exhibition_type)과 같은 결과"""
+        if exhibition_type is None:
+            return self.all
+        return self._views.get(self._key(exhibition_type), self.all)
+
+    def is_filtered(self, exhibition_type) -> bool:
+        """유형 조건이 실제로 적용되는지 (MIN_TYPE_ROWS개 미만이면 전체 사용)"""
+        return exhibition_type is not None and self._key(exhibition_type) in self._views
+
+    def count(self, exhibition_type) -> int:
+        """get_type_count(df, exhibition_type)과 같은 결과"""
+        key = None if exhibition_type is None else self._key(exhibition_type)
+        if key is None or not self._has_type:
+            return self.source_count
+        return self.counts.get(key, 0)
+
+
+_TYPE_PARTITION_CACHE: dict = {}
+
+
+def get_type_partition(df: pd.DataFrame) -> TypePartition:
+    """
+    레퍼런스 DataFrame의 유형별 분할. 레퍼런스 버전당 한 번만 만듭니다.
+    버전을 알 수 없는 DataFrame은 매번 새로 만듭니다. 버전 표시를 물려받은
+    행 부분집합도 get_reference_version이 None을 돌려주므로 여기에 해당하며,
+    전체 레퍼런스의 분할이 아니라 그 부분집합의 분할을 받습니다.
+    """
+    version = get_reference_version(df)
+    if version is None:
+        return TypePartition(df)
+    return _get_or_build(_TYPE_PARTITION_CACHE, version, lambda: TypePartition(df))
+
+
+# ──────────────────────────────────────────────
+# 기간별 통계 (전시 시작 연도 기준)
+# ──────────────────────────────────────────────
+
+START_DATE_COL = "전시 기간_시작"
+ALL_TIME_LABEL = "역대"
+# 비교 기간: 라벨 → 최근 N년 (None이면 전체). 레퍼런스의 가장 최근 시작 연도를 기준으로 셈
+PERIOD_WINDOWS = {
+    ALL_TIME_LABEL: None,
+    "최근 3년": 3,
+}
+
+_YEAR_PATTERN = re.compile(r"^\s*(\d{4})")
+
+
+def parse_start_year(value) -> int | None:
+    """'2021.10.01' 같은 시작일 값에서 연도를 추출 (datetime·숫자 연도도 허용, 실패 시 None)"""
+    if value is None:
+        return None
+    year = getattr(value, "year", None)
+    if isinstance(year, int):
+        return year
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        if np.isnan(value) or not 1000 <= value <= 9999:
+            return None
+        return int(value)
+    match = _YEAR_PATTERN.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class PeriodStats:
+    """한 기간의 필드 요약 (연도별 누적 집계를 합친 값)"""
+    field_name: str
+    count: int
+    mean: float
+    median: float
+    min_val: float
+    max_val: float
+    std: float
+
+
+def _merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """
+    두 묶음의 (개수, 평균, 편차 제곱합 M2)를 합칩니다 (Chan 병렬 공식).
+    합·제곱합으로 분산을 구하면 관객 수·예산처럼 큰 값에서 자릿수 상쇄가 생기므로 평균·M2로 누적합니다.
+    배열이면 컬럼별로 계산하며, 개수가 0인 쪽은 무시됩니다.
+    """
+    n = n_a + n_b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = mean_b - mean_a
+        weight = np.where(n > 0, n_b / np.where(n > 0, n, 1), 0.0)
+        mean = np.where(n_b > 0, np.where(n_a > 0, mean_a + delta * weight, mean_b), mean_a)
+        m2 = np.where(n_b > 0, np.where(n_a > 0, m2_a + m2_b + delta * delta * n_a * weight, m2_b), m2_a)
+    return n, mean, m2
+
+
+class _YearBucket:
+    """(유형, 연도) 한 칸의 컬럼별 누적 집계 — 개수·평균·M2·최솟값·최댓값 + 정렬된 값"""
+
+    __slots__ = ("count", "mean", "m2", "min_val", "max_val", "sorted_values")
+
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns, dtype=int)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min_val = np.full(n_columns, np.inf)
+        self.max_val = np.full(n_columns, -np.inf)
+        self.sorted_values = [np.empty(0) for _ in range(n_columns)]
+
+    def add(self, matrix: np.ndarray):
+        """행 여러 개(행 × 컬럼, NaN 허용)를 집계에 더함"""
+        valid = ~np.isnan(matrix)
+        n_new = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_new = np.where(valid, matrix, 0.0).sum(axis=0) / np.where(n_new > 0, n_new, 1)
+        dev = np.where(valid, matrix - mean_new, 0.0)
+        self.count, self.mean, self.m2 = _merge_moments(
+            self.count, self.mean, self.m2, n_new, mean_new, (dev * dev).sum(axis=0)
+        )
+        self.min_val = np.fmin(self.min_val, np.where(valid, matrix, np.inf).min(axis=0))
+        self.max_val = np.fmax(self.max_val, np.where(valid, matrix, -np.inf).max(axis=0))
+        for i in np.flatnonzero(valid.any(axis=0)):
+            merged = np.concatenate([self.sorted_values[i], matrix[valid[:, i], i]])
+            merged.sort()
+            self.sorted_values[i] = merged
+
+
+class PeriodStatsIndex:
+    """
+    전시 유형 × 시작 연도별 누적 집계로 여러 기간의 통계를 한 번에 내는 인덱스.
+
+    칸마다 개수·평균·M2(편차 제곱합)·최솟값·최댓값과 정렬된 값을 들고 있어, 기간 통계는
+    해당 연도 칸을 합치기만 하면 되고 DataFrame을 기간마다 다시 필터링하지 않습니다.
+    전시가 추가되면 extend()로 새 행만 해당 칸에 더합니다.
+    유형 0은 제외하며, 유형 대체 규칙(MIN_TYPE_ROWS)은 filter_by_type과 같습니다.
+    시작 연도를 알 수 없는 전시는 전체 기간에만 포함됩니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list | None = None):
+        if columns is None:
+            columns = NUMERIC_COLUMNS + DERIVED_METRIC_COLUMNS
+        self.columns = [c for c in columns if c in df.columns]
+        self._col_pos = {c: i for i, c in enumerate(self.columns)}
+        self._buckets: dict[tuple, _YearBucket] = {}
+        self.type_counts: dict = {}
+        self.row_count = 0
+        self.latest_year: int | None = None
+        self._lock = threading.Lock()
+        self.extend(df)
+
+    def extend(self, df: pd.DataFrame):
+        """새로 추가된 행만 집계에 더합니다 (이미 더한 행을 다시 넘기면 중복 집계됨)."""
+        if len(df) == 0:
+            return
+        df = compute_derived_metrics(df)
+        if EXHIBITION_TYPE_COL in df.columns:
+            types = pd.to_numeric(df[EXHIBITION_TYPE_COL], errors="coerce").to_numpy(dtype=float)
+        else:
+            types = np.full(len(df), np.nan)
+        if START_DATE_COL in df.columns:
+            years = [parse_start_year(v) for v in df[START_DATE_COL].to_numpy()]
+        else:
+            years = [None] * len(df)
+        matrix = df.reindex(columns=self.columns).to_numpy(dtype=float, na_value=np.nan)
+
+        groups: dict[tuple, list] = {}
+        for row, (t, year) in enumerate(zip(types, years)):
+            type_key = None if np.isnan(t) else float(t)
+            if type_key == EXCLUDED_TYPE:
+                continue
+            groups.setdefault((type_key, year), []).append(row)
+
+        with self._lock:
+            for t in types:
+                if not np.isnan(t):
+                    self.type_counts[float(t)] = self.type_counts.get(float(t), 0) + 1
+            for key, rows in groups.items():
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = _YearBucket(len(self.columns))
+                bucket.add(matrix[rows])
+            known = [year for _, year in groups if year is not None]
+            if known and (self.latest_year is None or max(known) > self.latest_year):
+                self.latest_year = max(known)
+            self.row_count += len(df)
+
+    # ── 기간 조회 ──
+
+    @property
+    def years(self) -> list:
+        """시작 연도 목록 (오름차순, 유형 0 제외)"""
+        return sorted({year for _, year in self._buckets if year is not None})
+
+    def window_start(self, years_back) -> int | None:
+        """최근 years_back년 기간의 시작 연도 (None이면 전체 기간)"""
+        if years_back is None or self.latest_year is None:
+            return None
+        return self.latest_year - int(years_back) + 1
+
+    def _type_key(self, exhibition_type):
+        """filter_by_type과 같은 대체 규칙을 적용한 유형 키 (None이면 유형 구분 없음)"""
+        if exhibition_type is None:
+            return None
+        try:
+            key = float(exhibition_type)
+        except (ValueError, TypeError):
+            return None
+        return key if self.type_counts.get(key, 0) >= MIN_TYPE_ROWS else None
+
+    def _select(self, exhibition_type, since):
+        type_key = self._type_key(exhibition_type)
+        return [
+            bucket for (t, year), bucket in self._buckets.items()
+            if (type_key is None or t == type_key)
+            and (since is None or (year is not None and year >= since))
+        ]
+
+    def stats(self, column: str, exhibition_type=None, since: int | None = None) -> PeriodStats | None:
+        """
+        since 연도 이후(None이면 전체) 전시의 필드 요약.
+        유효 값이 2개 미만이면 None (compute_stats와 같은 기준).
+        """
+        pos = self._col_pos.get(column)
+        if pos is None:
+            return None
+        with self._lock:
+            buckets = self._select(exhibition_type, since)
+            n, mean, m2 = 0, 0.0, 0.0
+            for b in buckets:
+                n, mean, m2 = _merge_moments(n, mean, m2, int(b.count[pos]), b.mean[pos], b.m2[pos])
+            n = int(n)
+            if n < 2:
+                return None
+            merged = np.concatenate([b.sorted_values[pos] for b in buckets])
+            lo = min(b.min_val[pos] for b in buckets)
+            hi = max(b.max_val[pos] for b in buckets)
+        variance = float(m2) / (n - 1)
+        return PeriodStats(
+            field_name=column,
+            count=n,
+            mean=float(mean),
+            median=float(np.median(merged)),
+            min_val=float(lo),
+            max_val=float(hi),
+            std=float(np.sqrt(variance)),
+        )
+
+    def percentile_of(self, column: str, value: float, exhibition_type=None,
+                      since: int | None = None) -> int | None:
+        """
+        값의 백분위 (0-100) — compute_percentile과 같은 정의.
+        연도 칸마다 이진 탐색한 개수를 더하므로 값을 합치지 않습니다. 유효 값이 없으면 None.
+        """
+        pos = self._col_pos.get(column)
+        if pos is None or value is None:
+            return None
+        below = equal = n = 0
+        with self._lock:
+            for bucket in self._select(exhibition_type, since):
+                vals = bucket.sorted_values[pos]
+                left = int(np.searchsorted(vals, value, side="left"))
+                below += left
+                equal += int(np.searchsorted(vals, value, side="right")) - left
+                n += len(vals)
+        if n == 0:
+            return None
+        return int(np.rint((below + equal * 0.5) / n * 100))
+
+    def compare(self, current: dict, columns: list, exhibition_type=None,
+                windows: dict | None = None) -> dict:
+        """
+        현재 값들을 여러 기간과 한 번에 비교합니다.
+
+        Returns:
+            {컬럼: {기간 라벨: (PeriodStats 또는 None, 백분위 또는 None)}}
+        """
+        if windows is None:
+            windows = PERIOD_WINDOWS
+        starts = {label: self.window_start(n) for label, n in windows.items()}
+        result = {}
+        for col in columns:
+            value = current.get(col)
+            result[col] = {
+                label: (
+                    self.stats(col, exhibition_type, since),
+                    self.percentile_of(col, value, exhibition_type, since) if value else None,
+                )
+                for label, since in starts.items()
+            }
+        return result
+
+
+REFERENCE_LINEAGE_ATTR = "reference_lineage"
+_PERIOD_INDEX_CACHE: dict = {}  # 계보(또는 버전) → (버전, 행 수, PeriodStatsIndex)
+_period_index_lock = threading.Lock()
+
+
+def get_period_index(df: pd.DataFrame) -> PeriodStatsIndex:
+    """
+    전체 레퍼런스 DataFrame의 기간별 통계 인덱스. 레퍼런스 버전당 한 번만 만듭니다.
+
+    추가 전용 저장소에서 읽은 DataFrame(attrs["reference_lineage"]가 있는 것)은
+    이전 버전의 행이 그대로 앞에 있으므로, 새 버전이 오면 인덱스를 다시 만들지 않고
+    뒤에 추가된 행만 extend()로 더합니다. (버전을 알 수 없는 DataFrame은 매번 새로 생성)
+    """
+    version = get_reference_version(df)
+    if version is None:
+        return PeriodStatsIndex(df)
+    lineage = df.attrs.get(REFERENCE_LINEAGE_ATTR)
+    key = lineage or version
+    with _period_index_lock:
+        cached = _PERIOD_INDEX_CACHE.get(key)
+        if cached is not None:
+            cached_version, cached_rows, index = cached
+            if cached_version == version:
+                return index
+            if lineage and cached_rows < len(df):
+                index.extend(df.iloc[cached_rows:])
+                _PERIOD_INDEX_CACHE[key] = (version, len(df), index)
+                return index
+        index = PeriodStatsIndex(df)
+        if key not in _PERIOD_INDEX_CACHE and len(_PERIOD_INDEX_CACHE) >= _STATS_INDEX_CACHE_SIZE:
+            _PERIOD_INDEX_CACHE.pop(next(iter(_PERIOD_INDEX_CACHE)))
+        _PERIOD_INDEX_CACHE[key] = (version, len(df), index)
+        return index
+
+
 # ──────────────────────────────────────────────
 # 파생 지표 계산
 # ──────────────────────────────────────────────
@@ -352,9 +1090,33 @@ def compute_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
         - 유료_비율: 유료 관객수 ÷ 총 관객수
         - 프로그램_참여율: 프로그램 참여 인원 ÷ 총 관객수
         - 관객당_보도건수: 총 관객수 ÷ 언론 보도 건수
+
+    load_reference가 로드 시점에 이미 계산해 둔 DataFrame(과 그 행 부분집합)은
+    복사·재계산 없이 그대로 반환합니다.
     """
+    if has_derived_metrics(df):
+        return df
     df = df.copy()
+    _add_derived_metrics(df)
+    return df
+
 
+def has_derived_metrics(df: pd.DataFrame) -> bool:
+    """파생 지표가 이미 계산된 DataFrame인지"""
+    return bool(df.attrs.get(DERIVED_METRICS_ATTR)) and all(
+        c in df.columns for c in DERIVED_METRIC_COLUMNS
+    )
+
+
+def _materialize_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """로드 직후의 레퍼런스 DataFrame에 파생 지표를 제자리 계산 (원본 컬럼이 없으면 건너뜀)"""
+    if all(c in df.columns for c in DERIVED_SOURCE_COLUMNS):
+        _add_derived_metrics(df)
+    return df
+
+
+def _add_derived_metrics(df: pd.DataFrame):
+    """파생 지표 컬럼을 df에 직접 추가"""
     # 관객당 비용 (원) — 필터링 없이 원본 비율 그대로 보존
     # (전시 유형별 비교로 이상값 문제를 해결)
     with np.errstate(divide="ignore", invalid="ignore"):
@@ -392,7 +1154,7 @@ def compute_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
             np.nan,
         )
 
-    return df
+    df.attrs[DERIVED_METRICS_ATTR] = True
 
 
 # ──────────────────────────────────────────────
@@ -467,14 +1229,22 @@ def app_data_to_reference_dict(app_data: dict) -> dict:
 # 레퍼런스 갱신
 # ──────────────────────────────────────────────
 
-def add_exhibition_to_reference(xlsx_path: str, new_data: dict):
+def add_exhibition_to_reference(xlsx_path: str, new_data: dict, source_xlsx: str = None):
     """
-    새 전시 데이터를 레퍼런스 Excel에 추가합니다.
+    새 전시 데이터를 레퍼런스에 추가합니다.
+
+    경로가 레퍼런스 저장소(*.db 등)이면 한 행만 추가하고(기존 데이터는 다시 쓰지 않음),
+    Excel이면 기존 방식대로 통합 문서 전체를 다시 저장합니다.
 
     Args:
-        xlsx_path: Excel 파일 경로
+        xlsx_path: 레퍼런스 저장소 또는 Excel 파일 경로
         new_data: flat dict (키: 컬럼명, 값: 데이터)
+        source_xlsx: 저장소가 아직 가져오지 않았으면 먼저 가져올 원본 Excel
     """
+    if reference_store.is_store_path(xlsx_path):
+        reference_store.open_store(xlsx_path, source_xlsx).append(new_data)
+        return
+
     import openpyxl
 
     wb = openpyxl.load_workbook(xlsx_path)
@@ -505,6 +1275,12 @@ def add_exhibition_to_reference(xlsx_path: str, new_data: dict):
 
     wb.save(xlsx_path)
 
+    # 파싱 캐시(파생 지표 포함)를 바로 무효화 — 다음 load_reference에서 다시 계산
+    try:
+        os.remove(xlsx_path + REFERENCE_CACHE_SUFFIX)
+    except OSError:
+        pass
+
 
 # ──────────────────────────────────────────────
 # 포맷팅 유틸리티
@@ -0,0 +1,366 @@
+"""
+레퍼런스 저장소 (SQLite, 추가 전용)
+- 과거 전시 데이터를 SQLite 파일에 한 전시당 한 행으로 저장
+- 새 전시 추가는 INSERT 한 번 (Excel 전체를 다시 쓰지 않음)
+- 읽기는 프로세스 안에 캐시해 두고, 마지막으로 읽은 뒤 추가된 행만 가져옴
+- Excel(xlsx)은 최초 가져오기와 내보내기 형식으로만 사용
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+
+# ──────────────────────────────────────────────
+# 설정
+# ──────────────────────────────────────────────
+
+REFERENCE_XLSX_NAME = "exhibition_reference_data.xlsx"
+REFERENCE_STORE_NAME = "exhibition_reference.db"
+REFERENCE_STORE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# 앱이 사용할 레퍼런스 백엔드: "sqlite"(기본) 또는 "xlsx"(Excel 직접 읽기)
+REFERENCE_BACKEND_ENV = "REFERENCE_BACKEND"
+
+STORE_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exhibitions (
+    row_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+    added_at TEXT NOT NULL DEFAULT (datetime('now')),
+    record   TEXT NOT NULL  -- {컬럼명: 값} JSON (숫자는 숫자, 빈 값은 생략)
+);
+"""
+
+
+def is_store_path(path) -> bool:
+    """SQLite 레퍼런스 저장소 경로인지 (확장자 기준)"""
+    return str(path).lower().endswith(REFERENCE_STORE_SUFFIXES)
+
+
+def find_reference_source(base_dir):
+    """
+    base_dir과 그 상위 폴더에서 레퍼런스 저장소·Excel을 찾습니다.
+
+    Returns:
+        (저장소 경로, Excel 경로 또는 None). 저장소는 아직 없을 수 있으며,
+        없으면 Excel이 있는 폴더(둘 다 없으면 base_dir)에 만들 경로를 돌려줍니다.
+    """
+    for folder in (base_dir, os.path.join(base_dir, "..")):
+        folder = os.path.abspath(folder)
+        db_path = os.path.join(folder, REFERENCE_STORE_NAME)
+        xlsx_path = os.path.join(folder, REFERENCE_XLSX_NAME)
+        if os.path.exists(db_path):
+            return db_path, xlsx_path if os.path.exists(xlsx_path) else None
+        if os.path.exists(xlsx_path):
+            return db_path, xlsx_path
+    return os.path.join(os.path.abspath(base_dir), REFERENCE_STORE_NAME), None
+
+
+def _derived_columns():
+    """파생 지표 컬럼 — 불러올 때 계산하므로 저장하지 않음"""
+    from reference_data import DERIVED_METRIC_COLUMNS
+    return DERIVED_METRIC_COLUMNS
+
+
+def _store_version(store_id, last_row_id):
+    return f"{store_id[:8]}{last_row_id:08x}"
+
+
+def _to_json_value(value):
+    """DataFrame·앱 값 → JSON 값 (NaN·빈 문자열은 None)"""
+    if value is None:
+        return None
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, (bool, int)):
+        return value
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y.%m.%d")
+    text = str(value).strip()
+    return text or None
+
+
+# ──────────────────────────────────────────────
+# 저장소
+# ──────────────────────────────────────────────
+
+class ReferenceStore:
+    """SQLite 레퍼런스 저장소 (추가 전용)"""
+
+    def __init__(self, db_path):
+        self.db_path = os.path.abspath(db_path)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            if self._get_meta("schema_version") is None:
+                self._set_meta("schema_version", STORE_SCHEMA_VERSION)
+                self._set_meta("store_id", uuid.uuid4().hex)
+                self._set_meta("columns", [])
+
+    def close(self):
+        self._conn.close()
+
+    # ── 메타데이터 ──
+
+    def _get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT INTO meta(key, value) VALUES(?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, ensure_ascii=False)),
+        )
+
+    @property
+    def store_id(self) -> str:
+        return self._get_meta("store_id")
+
+    @property
+    def columns(self) -> list:
+        """컬럼 순서 (Excel 헤더 순서, 이후 추가된 필드는 뒤에 붙음)"""
+        return self._get_meta("columns") or []
+
+    def last_row_id(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(row_id) FROM exhibitions").fetchone()
+        return row[0] or 0
+
+    def version(self) -> str:
+        """저장소 버전 — 저장소 ID + 마지막 행 번호 (추가 전용이므로 내용이 바뀌면 반드시 바뀜)"""
+        return _store_version(self.store_id, self.last_row_id())
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM exhibitions").fetchone()[0]
+
+    # ── 쓰기 ──
+
+    def append(self, record: dict) -> int:
+        """
+        전시 한 건을 추가하고 행 번호를 반환합니다. 기존 행은 읽지도 다시 쓰지도 않습니다.
+
+        Args:
+            record: flat dict (키: 컬럼명, 값: 데이터). None·NaN 값은 저장하지 않음
+        """
+        values = {str(k).strip(): _to_json_value(v) for k, v in record.items()}
+        derived = _derived_columns()
+        values = {k: v for k, v in values.items()
+                  if v is not None and k != "No." and k not in derived}
+        if not values.get("전시 제목"):
+            raise ValueError("전시 제목이 없는 데이터는 레퍼런스에 추가할 수 없습니다.")
+        with self._lock, self._conn:
+            columns = self.columns
+            new_columns = [k for k in values if k not in columns]
+            if new_columns:
+                self._set_meta("columns", columns + new_columns)
+            cur = self._conn.execute(
+                "INSERT INTO exhibitions(record) VALUES(?)",
+                (json.dumps(values, ensure_ascii=False),),
+            )
+            return cur.lastrowid
+
+    def import_frame(self, df: pd.DataFrame, category_row=None, replace=False,
+                     before_existing=False, source=None):
+        """
+        DataFrame(load_reference 결과 형식)의 모든 행을 가져옵니다.
+
+        Args:
+            category_row: Excel 1행(카테고리 헤더) 값 목록 — 내보내기 때 복원
+            replace: True면 기존 행을 모두 지우고 새 저장소 ID를 발급
+            before_existing: True면 가져온 행을 기존 행 앞에 둠 (행 번호가 바뀌므로 새 저장소 ID 발급)
+            source: 가져온 원본 이름 — meta "imported_source"에 기록
+        """
+        derived = _derived_columns()
+        rows = []
+        for rec in df.to_dict(orient="records"):
+            values = {k: _to_json_value(v) for k, v in rec.items()
+                      if k != "No." and k not in derived}
+            rows.append((json.dumps({k: v for k, v in values.items() if v is not None},
+                                    ensure_ascii=False),))
+        with self._lock, self._conn:
+            kept = []
+            if before_existing and not replace:
+                kept = self._conn.execute(
+                    "SELECT added_at, record FROM exhibitions ORDER BY row_id"
+                ).fetchall()
+            if replace or kept:
+                self._conn.execute("DELETE FROM exhibitions")
+                self._set_meta("store_id", uuid.uuid4().hex)
+            if replace:
+                self._set_meta("columns", [])
+            if source is not None:
+                self._set_meta("imported_source", source)
+            columns = self.columns
+            incoming = [str(c) for c in df.columns if c not in derived]
+            if kept:
+                # 기존 행 앞에 두므로 컬럼 순서도 가져온 쪽을 먼저
+                columns = incoming + [c for c in columns if c not in incoming]
+            else:
+                columns = columns + [c for c in incoming if c not in columns]
+            self._set_meta("columns", columns)
+            if category_row is not None:
+                self._set_meta("category_row", [_to_json_value(v) for v in category_row])
+            self._conn.executemany("INSERT INTO exhibitions(record) VALUES(?)", rows)
+            self._conn.executemany("INSERT INTO exhibitions(added_at, record) VALUES(?, ?)", kept)
+
+    @property
+    def has_imported_xlsx(self) -> bool:
+        """Excel을 가져온 적이 있는지 (meta 기록 이전 저장소는 카테고리 행 유무로 판단)"""
+        return (self._get_meta("imported_source") is not None
+                or self._get_meta("category_row") is not None)
+
+    def import_xlsx(self, xlsx_path, replace=False):
+        """
+        레퍼런스 Excel을 가져옵니다 (카테고리 헤더 행 포함).
+        이미 추가된 행이 있으면 Excel의 과거 전시를 그 앞에 둡니다.
+        """
+        import openpyxl
+        from reference_data import _parse_reference_xlsx
+
+        df = _parse_reference_xlsx(xlsx_path)
+        wb = openpyxl.load_workbook(xlsx_path, read_only=True)
+        try:
+            category_row = [c for c in next(wb.active.iter_rows(min_row=1, max_row=1, values_only=True))]
+        finally:
+            wb.close()
+        self.import_frame(df, category_row=category_row, replace=replace,
+                          before_existing=True, source=os.path.basename(xlsx_path))
+
+    # ── 읽기 ──
+
+    def read_records(self, after_row_id=0):
+        """after_row_id 이후에 추가된 (행 번호, record dict) 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_id, record FROM exhibitions WHERE row_id > ? ORDER BY row_id",
+                (after_row_id,),
+            ).fetchall()
+        return [(row_id, json.loads(record)) for row_id, record in rows]
+
+    def export_xlsx(self, xlsx_path):
+        """레퍼런스 Excel 형식(1행 카테고리, 2행 컬럼명, 3행부터 데이터)으로 내보내기"""
+        import openpyxl
+
+        columns = self.columns
+        if "No." not in columns:
+            columns = ["No."] + columns
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "레퍼런스 데이터"
+        ws.append(self._get_meta("category_row") or [None] * len(columns))
+        ws.append(columns)
+        for i, (_, record) in enumerate(self.read_records(), start=1):
+            record["No."] = i
+            ws.append([record.get(c) for c in columns])
+        wb.save(xlsx_path)
+
+
+# ──────────────────────────────────────────────
+# DataFrame 로드 (프로세스 안 증분 캐시)
+# ──────────────────────────────────────────────
+
+_stores: dict = {}  # 경로 → ReferenceStore
+_frames: dict = {}  # 경로 → {"store_id", "last_row_id", "records", "version", "frame"}
+_frames_lock = threading.Lock()
+
+
+def open_store(db_path, xlsx_path=None) -> ReferenceStore:
+    """
+    저장소를 엽니다 (프로세스 안에서 경로당 하나 재사용).
+    xlsx_path가 주어지고 저장소가 아직 Excel을 가져온 적이 없으면 먼저 가져옵니다
+    (Excel 없이 먼저 추가된 행이 있어도 과거 전시가 빠지지 않도록, 비어 있는지가 아니라 가져온 기록으로 판단).
+    """
+    db_path = os.path.abspath(db_path)
+    with _frames_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = _stores[db_path] = ReferenceStore(db_path)
+        if xlsx_path and os.path.exists(xlsx_path) and not store.has_imported_xlsx:
+            store.import_xlsx(xlsx_path)
+    return store
+
+
+def resolve_reference_source(base_dir):
+    """
+    앱이 사용할 레퍼런스 원본 — 로드·추가·내보내기가 모두 같은 원본을 쓰도록 한곳에서 결정.
+
+    REFERENCE_BACKEND=xlsx이거나 저장소를 만들 수 없는 환경(읽기 전용 등)이면 Excel,
+    그 밖에는 저장소(처음이면 Excel을 가져와 생성)를 사용합니다.
+
+    Returns:
+        (레퍼런스 경로 또는 None, Excel 경로 또는 None) — 레퍼런스 경로는 저장소 또는 Excel
+    """
+    db_path, xlsx_path = find_reference_source(base_dir)
+    if os.environ.get(REFERENCE_BACKEND_ENV, "sqlite").lower() == "xlsx":
+        return xlsx_path, xlsx_path
+    if os.path.exists(db_path) or xlsx_path:
+        try:
+            open_store(db_path, xlsx_path)
+            return db_path, xlsx_path
+        except (sqlite3.Error, OSError):
+            pass
+    return xlsx_path, xlsx_path
+
+
+def _records_to_frame(records, columns) -> pd.DataFrame:
+    """record dict 목록 → load_reference와 같은 형식의 DataFrame"""
+    from reference_data import NUMERIC_COLUMNS, _materialize_derived_metrics
+
+    df = pd.DataFrame.from_records(records, columns=[c for c in columns if c != "No."])
+    for col in NUMERIC_COLUMNS + ["전시 유형"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "No." in columns:
+        df.insert(columns.index("No."), "No.", range(1, len(df) + 1))
+    # 파생 지표는 저장소 버전당 한 번 계산 (행이 추가되면 새 버전으로 다시 계산)
+    return _materialize_derived_metrics(df)
+
+
+def load_store_frame(db_path) -> pd.DataFrame:
+    """
+    저장소 전체를 DataFrame으로 반환합니다.
+
+    이전에 읽은 행은 프로세스 안에 남겨 두고, 그 뒤에 추가된 행만 읽어 붙입니다.
+    반환된 DataFrame의 attrs["reference_version"]은 저장소 버전이며,
+    버전이 같으면 같은 DataFrame 객체를 돌려주므로 수정하지 말고 사용합니다.
+    """
+    from reference_data import _with_version
+
+    store = open_store(db_path)
+    with _frames_lock:
+        state = _frames.get(store.db_path)
+        if state is None or state["store_id"] != store.store_id:
+            state = {"store_id": store.store_id, "last_row_id": 0, "records": [],
+                     "version": None, "frame": None}
+            _frames[store.db_path] = state
+
+        new_rows = store.read_records(state["last_row_id"])
+        if new_rows:
+            state["records"].extend(record for _, record in new_rows)
+            state["last_row_id"] = new_rows[-1][0]
+        version = _store_version(state["store_id"], state["last_row_id"])
+        if state["version"] != version:
+            state["frame"] = _records_to_frame(state["records"], store.columns)
+            _with_version(state["frame"], version)
+            # 같은 저장소의 새 버전은 이전 행 뒤에 추가된 행만 다름 (기간별 통계 증분 갱신용)
+            state["frame"].attrs["reference_lineage"] = state["store_id"]
+            state["version"] = version
+        return state["frame"]
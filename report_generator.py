@@ -9,8 +9,12 @@
 from docx import Document
 from docx.shared import Pt, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+import io
+import logging
 import os
 import tempfile
+import threading
+import time
 
 from styles import (
     setup_document, set_run_font, add_paragraph, add_horizontal_rule,
@@ -21,47 +25,149 @@ from styles import (
     add_page_break, add_page_numbers_right,
     Colors, Fonts, CIRCLED_NUMBERS, ImageSize,
 )
-from chart_generator import (
-    create_visitor_pie_chart,
-    create_weekly_visitors_chart,
-    create_budget_comparison_chart,
-    create_visitor_type_chart,
-)
+from chart_generator import render_charts, render_chart_png
+from image_processing import preprocess_report_images
+import profiling
+
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────
+# 문서 골격 (스타일·페이지 설정·쪽 번호·목차)
+# ──────────────────────────────────────────────
+
+TOC_ITEMS = [
+    "I. 전시 개요",
+    "II. 전시 주제와 내용",
+    "III. 전시 구성",
+    "IV. 전시 결과",
+    "V. 홍보 방식 및 언론 보도",
+    "VI. 평가 및 개선 방안",
+]
+
+_skeleton_bytes = None
+_skeleton_lock = threading.Lock()
+
+
+def _build_skeleton():
+    """보고서마다 같은 부분(페이지 설정, 우측 하단 쪽 번호, 목차 틀)만 담은 .docx bytes"""
+    doc = Document()
+    setup_document(doc)
+    add_page_numbers_right(doc)
+
+    # 목차 제목 — 보고서별 전시 제목은 _create_toc_page에서 채움
+    add_paragraph(
+        doc, "전시보고서 - 《》",
+        size=Fonts.TOC_TITLE, bold=True,
+        alignment=WD_ALIGN_PARAGRAPH.CENTER,
+        space_before=Pt(12), space_after=Pt(4)
+    )
+    add_horizontal_rule(doc)
+
+    for item in TOC_ITEMS:
+        add_paragraph(
+            doc, item,
+            size=Fonts.TOC_ITEM, bold=True,
+            space_before=Pt(3), space_after=Pt(3),
+            line_spacing=1.15
+        )
+        add_horizontal_rule(doc)
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def get_skeleton_bytes():
+    """문서 골격을 프로세스당 한 번 만들어 bytes로 캐시"""
+    global _skeleton_bytes
+    if _skeleton_bytes is None:
+        with _skeleton_lock:
+            if _skeleton_bytes is None:
+                _skeleton_bytes = _build_skeleton()
+    return _skeleton_bytes
+
+
+def new_report_document():
+    """캐시된 골격을 복제한 새 Document"""
+    return Document(io.BytesIO(get_skeleton_bytes()))
 
 
 class ExhibitionReportGenerator:
     """전시보고서 생성기"""
 
-    def __init__(self, data):
+    def __init__(self, data, optimize_images=True, cprofile=False):
         self.data = data
-        self.doc = Document()
+        self.doc = new_report_document()
         self.temp_files = []
+        self.optimize_images = optimize_images
+        self.cprofile = cprofile  # True면 cProfile 결과도 self.profile에 수집
+        self.charts = {}  # 미리 렌더링한 차트 {이름: PNG bytes}
+        self.profile = profiling.GenerationProfile()  # 마지막 generate의 단계별 소요 시간
+
+    def generate(self, output=None):
+        """
+        전체 보고서 생성
+
+        Args:
+            output: 저장할 파일 경로, 쓰기 가능한 스트림(BytesIO 등), 또는 None
+
+        Returns:
+            경로를 주면 경로, 스트림을 주면 그 스트림, None이면 .docx bytes
+            (단계별 소요 시간은 self.profile에 남고 logging INFO로도 기록됨)
+        """
+        self.profile = profiling.GenerationProfile()
+        start = time.perf_counter()
+        with profiling.activate(self.profile):
+            if self.cprofile:
+                with profiling.capture_cprofile(self.profile):
+                    result = self._generate(output)
+            else:
+                result = self._generate(output)
+        self.profile.total_seconds = time.perf_counter() - start
+        logger.info("%s", self.profile.format_text())
+        return result
 
-    def generate(self, output_path):
-        """전체 보고서 생성"""
-        setup_document(self.doc)
-        add_page_numbers_right(self.doc)
+    def _generate(self, output):
+        stage = self.profile.stage
 
-        self._create_toc_page()
+        with stage("차트 사전 렌더링", "prepare"):
+            self._prerender_charts()
+
+        # 업로드 원본 이미지를 표시 크기에 맞게 축소·재압축 (EXIF 제거)
+        if self.optimize_images:
+            with stage("이미지 전처리", "prepare"):
+                self.data = preprocess_report_images(self.data)
+
+        # 페이지 설정·쪽 번호·목차 틀은 골격에 이미 들어 있음
+        with stage("_create_toc_page", "section"):
+            self._create_toc_page()
         add_page_break(self.doc)
 
-        self._section_1_overview()
+        with stage("_section_1_overview", "section"):
+            self._section_1_overview()
         # 전시 개요 후 바로 전시 주제와 내용 (페이지 나누기 없이 이어짐)
 
-        self._section_2_theme()
+        with stage("_section_2_theme", "section"):
+            self._section_2_theme()
         add_page_break(self.doc)
 
-        self._section_3_composition()
+        with stage("_section_3_composition", "section"):
+            self._section_3_composition()
         add_page_break(self.doc)
 
-        self._section_4_results()
+        with stage("_section_4_results", "section"):
+            self._section_4_results()
 
         if self._has_promotion_data():
             add_page_break(self.doc)
-            self._section_5_promotion()
+            with stage("_section_5_promotion", "section"):
+                self._section_5_promotion()
 
         add_page_break(self.doc)
-        self._section_6_evaluation()
+        with stage("_section_6_evaluation", "section"):
+            self._section_6_evaluation()
 
         # 보고서 끝 표기
         add_paragraph(self.doc, "")  # 빈 줄
@@ -73,9 +179,59 @@ class ExhibitionReportGenerator:
             line_spacing=1.15
         )
 
-        self.doc.save(output_path)
+        # 경로 없이 메모리로 바로 저장 가능 (다운로드 버튼 등에서 임시 파일 불필요)
+        target = io.BytesIO() if output is None else output
+        with stage("doc.save", "save"):
+            self.doc.save(target)
         self._cleanup()
-        return output_path
+        return target.getvalue() if output is None else output
+
+    # ══════════════════════════════════════════
+    # 차트 사전 렌더링
+    # ══════════════════════════════════════════
+
+    def _collect_chart_requests(self):
+        """보고서에 들어갈 차트 요청 {이름: (종류, 키워드 인자)}"""
+        requests = {}
+
+        chart_data = self.data.get("budget", {}).get("chart_data", {})
+        if chart_data:
+            categories = list(chart_data.keys())
+            requests["budget"] = ("budget_comparison", {
+                "categories": categories,
+                "planned": [chart_data[c].get("planned", 0) for c in categories],
+                "actual": [chart_data[c].get("actual", 0) for c in categories],
+            })
+
+        vc = self.data.get("visitor_composition", {})
+        if vc.get("ticket_type"):
+            requests["ticket_type"] = ("visitor_pie", {
+                "data": vc["ticket_type"], "title": "입장권별 관객 구성",
+            })
+        if vc.get("visitor_type"):
+            requests["visitor_type"] = ("visitor_type", {"data": vc["visitor_type"]})
+        if vc.get("weekly_visitors"):
+            requests["weekly"] = ("weekly_bar", {"data": vc["weekly_visitors"]})
+
+        return requests
+
+    def _prerender_charts(self):
+        """모든 차트를 섹션 작성 전에 한꺼번에 렌더링 (캐시에 있는 차트는 재사용)"""
+        requests = self._collect_chart_requests()
+        if requests:
+            timings = {}
+            self.charts = render_charts(requests, timings=timings)
+            for name, (seconds, source) in timings.items():
+                self.profile.add(name, "chart", seconds, source)
+
+    def _chart(self, name):
+        """미리 렌더링한 차트를 파일 객체로 반환 (없으면 지금 렌더링)"""
+        png = self.charts.get(name)
+        if png is None:
+            kind, kwargs = self._collect_chart_requests()[name]
+            with self.profile.stage(name, "chart", "순차"):
+                png = self.charts[name] = render_chart_png(kind, kwargs)
+        return io.BytesIO(png)
 
     def _cleanup(self):
         for f in self.temp_files:
@@ -89,35 +245,11 @@ class ExhibitionReportGenerator:
     # ══════════════════════════════════════════
 
     def _create_toc_page(self):
-        """목차 페이지 — 제목 + 수평선 + 목차 항목들 + 포스터 이미지"""
+        """목차 페이지 — 제목 + 수평선 + 목차 항목들 (골격) + 포스터 이미지"""
         title = self.data.get("exhibition_title", "전시 제목")
 
-        # 제목
-        add_paragraph(
-            self.doc, f"전시보고서 - 《{title}》",
-            size=Fonts.TOC_TITLE, bold=True,
-            alignment=WD_ALIGN_PARAGRAPH.CENTER,
-            space_before=Pt(12), space_after=Pt(4)
-        )
-        add_horizontal_rule(self.doc)
-
-        # 목차 항목
-        toc_items = [
-            "I. 전시 개요",
-            "II. 전시 주제와 내용",
-            "III. 전시 구성",
-            "IV. 전시 결과",
-            "V. 홍보 방식 및 언론 보도",
-            "VI. 평가 및 개선 방안",
-        ]
-        for item in toc_items:
-            add_paragraph(
-                self.doc, item,
-                size=Fonts.TOC_ITEM, bold=True,
-                space_before=Pt(3), space_after=Pt(3),
-                line_spacing=1.15
-            )
-            add_horizontal_rule(self.doc)
+        # 골격의 첫 문단이 목차 제목
+        self.doc.paragraphs[0].runs[0].text = f"전시보고서 - 《{title}》"
 
         # 포스터 이미지 (있으면)
         poster = self.data.get("poster_image")
@@ -411,12 +543,7 @@ class ExhibitionReportGenerator:
         # 예산 비교 차트 (자동 생성)
         chart_data = budget.get("chart_data", {})
         if chart_data:
-            categories = list(chart_data.keys())
-            planned = [chart_data[c].get("planned", 0) for c in categories]
-            actual = [chart_data[c].get("actual", 0) for c in categories]
-            chart_path = create_budget_comparison_chart(categories, planned, actual)
-            self.temp_files.append(chart_path)
-            add_image(self.doc, chart_path, is_chart=True)
+            add_image(self.doc, self._chart("budget"), is_chart=True)
 
         # 상세 예산 집행 내역
         details = budget.get("details", [])
@@ -482,9 +609,7 @@ class ExhibitionReportGenerator:
         # 입장권별 파이차트
         ticket_type = vc.get("ticket_type", {})
         if ticket_type:
-            chart_path = create_visitor_pie_chart(ticket_type, title="입장권별 관객 구성")
-            self.temp_files.append(chart_path)
-            add_image(self.doc, chart_path, is_chart=True)
+            add_image(self.doc, self._chart("ticket_type"), is_chart=True)
 
         # 분석 불릿
         if vc.get("ticket_analysis"):
@@ -500,18 +625,14 @@ class ExhibitionReportGenerator:
         # 유형별 관객 수 파이차트
         visitor_type = vc.get("visitor_type", {})
         if visitor_type:
-            chart_path = create_visitor_type_chart(visitor_type)
-            self.temp_files.append(chart_path)
             add_paragraph(self.doc, "", space_before=Pt(8))
-            add_image(self.doc, chart_path, is_chart=True)
+            add_image(self.doc, self._chart("visitor_type"), is_chart=True)
 
         # 주별 관객 수 바 차트
         weekly = vc.get("weekly_visitors", {})
         if weekly:
-            chart_path = create_weekly_visitors_chart(weekly)
-            self.temp_files.append(chart_path)
             add_paragraph(self.doc, "", space_before=Pt(8))
-            add_image(self.doc, chart_path, is_chart=True)
+            add_image(self.doc, self._chart("weekly"), is_chart=True)
 
         # 관객 분석 텍스트
         analysis = vc.get("analysis", "")
@@ -755,10 +876,15 @@ class ExhibitionReportGenerator:
 # 편의 함수
 # ──────────────────────────────────────────────
 
-def generate_report(data, output_path):
-    """보고서 생성"""
-    generator = ExhibitionReportGenerator(data)
-    return generator.generate(output_path)
+def generate_report(data, output=None, with_profile=False, cprofile=False):
+    """
+    보고서 생성 (output: 경로·스트림·None → ExhibitionReportGenerator.generate 참고)
+
+    with_profile=True면 (결과, GenerationProfile)을 반환합니다.
+    """
+    generator = ExhibitionReportGenerator(data, cprofile=cprofile)
+    result = generator.generate(output)
+    return (result, generator.profile) if with_profile else result
 
 
 # ──────────────────────────────────────────────
@@ -12,7 +12,11 @@ from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.enum.section import WD_ORIENT
 from docx.oxml.ns import qn, nsdecls
 from docx.oxml import parse_xml
+from docx.table import _Cell as _TableCell
 import copy
+import os
+
+import profiling
 
 
 # ──────────────────────────────────────────────
@@ -261,77 +265,119 @@ def add_arrow_note(doc, text):
 # ──────────────────────────────────────────────
 
 def create_table(doc, rows, cols, data=None, headers=None,
-                 col_widths=None, header_bg=True):
-    """스타일 표 생성 (회색 헤더 + 검정 테두리)"""
+                 col_widths=None, header_bg=True, data_cell_format=None):
+    """스타일 표 생성 (회색 헤더 + 검정 테두리)
+
+    열마다 헤더/데이터 셀을 한 번만 서식 지정해 템플릿으로 만든 뒤,
+    나머지 셀은 템플릿 XML을 복제하고 텍스트만 바꿔 한 번에 채웁니다.
+    (셀마다 tcPr·rPr 요소를 새로 만들던 방식과 결과 XML은 동일)
+
+    Args:
+        data_cell_format: (열 번호, 셀)을 받아 데이터 셀 템플릿에 서식을 더하는 함수
+            — 열마다 한 번만 호출되고 결과가 그 열의 모든 데이터 셀에 복제됨
+    """
     total_rows = rows + (1 if headers else 0)
-    table = doc.add_table(rows=total_rows, cols=cols)
+    table = doc.add_table(rows=min(total_rows, 1), cols=cols)
     table.alignment = WD_TABLE_ALIGNMENT.CENTER
     table.autofit = False
 
-    # 열 너비
-    if col_widths:
-        for i, width in enumerate(col_widths):
-            for row in table.rows:
-                row.cells[i].width = width
-
     # 테두리
     _set_table_borders(table)
 
+    if total_rows == 0:
+        return table
+
+    # 열 너비 — 첫 행에 적용한 빈 셀이 열별 기본 템플릿
+    proto_tr = table._tbl.tr_lst[0]
+    if col_widths:
+        first_cells = table.rows[0].cells
+        for i, width in enumerate(col_widths):
+            first_cells[i].width = width
+    blank_tcs = [copy.deepcopy(tc) for tc in proto_tr.tc_lst]
+
+    def templates(header):
+        result = []
+        for c, blank in enumerate(blank_tcs):
+            tc = copy.deepcopy(blank)
+            cell = _TableCell(tc, table)
+            _fill_table_cell(cell, "", header=header, header_bg=header_bg)
+            if not header and data_cell_format is not None:
+                data_cell_format(c, cell)
+            result.append(tc)
+        return result
+
+    def make_row(template_tcs, values):
+        if len(values) > len(blank_tcs):
+            raise IndexError(f"표 열 수({cols})보다 값이 많습니다: {len(values)}개")
+        tr = copy.deepcopy(proto_tr)
+        for tc in tr.tc_lst:
+            tr.remove(tc)
+        for c, blank in enumerate(blank_tcs):
+            if c < len(values):
+                tc = copy.deepcopy(template_tcs[c])
+                if values[c]:
+                    tc.p_lst[0].r_lst[-1].text = values[c]
+            else:
+                tc = copy.deepcopy(blank)
+            tr.append(tc)
+        return tr
+
+    new_rows = []
+
     # 헤더 행
     if headers:
-        for i, header_text in enumerate(headers):
-            cell = table.rows[0].cells[i]
-            cell.text = ""
-            para = cell.paragraphs[0]
-            para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            para.paragraph_format.space_before = Pt(2)
-            para.paragraph_format.space_after = Pt(2)
-            run = para.add_run(header_text)
-            set_run_font(run, size=Fonts.TABLE_HEADER, bold=True)
-            if header_bg:
-                _set_cell_bg(cell, Colors.TABLE_HEADER_BG)
-            _set_cell_vertical_center(cell)
+        new_rows.append(make_row(templates(header=True), list(headers)))
 
     # 데이터
-    if data:
-        start = 1 if headers else 0
-        for r, row_data in enumerate(data):
-            for c, cell_text in enumerate(row_data):
-                cell = table.rows[start + r].cells[c]
-                cell.text = ""
-                para = cell.paragraphs[0]
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                para.paragraph_format.space_before = Pt(2)
-                para.paragraph_format.space_after = Pt(2)
-                run = para.add_run(str(cell_text))
-                set_run_font(run, size=Fonts.TABLE_CELL)
-                _set_cell_vertical_center(cell)
+    if data and len(data) > rows:
+        raise IndexError(f"표 행 수({rows})보다 데이터가 많습니다: {len(data)}행")
+    data_templates = templates(header=False) if data else None
+    for r in range(rows):
+        row_data = data[r] if data and r < len(data) else []
+        new_rows.append(make_row(data_templates, [str(v) for v in row_data]))
+
+    tbl = table._tbl
+    tbl.remove(proto_tr)
+    for tr in new_rows:
+        tbl.append(tr)
 
     return table
 
 
+def _fill_table_cell(cell, text, header=False, header_bg=True):
+    """표 셀 하나 채우기 (가운데 정렬, 수직 가운데, 헤더는 굵게 + 회색 배경)"""
+    cell.text = ""
+    para = cell.paragraphs[0]
+    para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    para.paragraph_format.space_before = Pt(2)
+    para.paragraph_format.space_after = Pt(2)
+    run = para.add_run(text)
+    if header:
+        set_run_font(run, size=Fonts.TABLE_HEADER, bold=True)
+        if header_bg:
+            _set_cell_bg(cell, Colors.TABLE_HEADER_BG)
+    else:
+        set_run_font(run, size=Fonts.TABLE_CELL)
+    _set_cell_vertical_center(cell)
+
+
 def create_table_left_aligned(doc, rows, cols, data=None, headers=None,
                                col_widths=None, first_col_bold=False):
     """좌측 정렬 표 (첫 열 굵게 옵션)"""
-    table = create_table(doc, rows, cols, data=data, headers=headers,
-                         col_widths=col_widths)
-
-    # 데이터 셀을 좌측 정렬로 변경
-    start = 1 if headers else 0
-    if data:
-        for r, row_data in enumerate(data):
-            for c, _ in enumerate(row_data):
-                cell = table.rows[start + r].cells[c]
-                for para in cell.paragraphs:
-                    if c == 0:
-                        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    else:
-                        para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    if first_col_bold and c == 0:
-                        for run in para.runs:
-                            run.font.bold = True
 
-    return table
+    # 데이터 셀 템플릿을 좌측 정렬로 변경 (첫 열은 가운데 정렬)
+    def left_align(c, cell):
+        for para in cell.paragraphs:
+            if c == 0:
+                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            else:
+                para.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            if first_col_bold and c == 0:
+                for run in para.runs:
+                    run.font.bold = True
+
+    return create_table(doc, rows, cols, data=data, headers=headers,
+                        col_widths=col_widths, data_cell_format=left_align)
 
 
 # ──────────────────────────────────────────────
@@ -385,14 +431,25 @@ class ImageSize:
     POSTER_WIDTH = Cm(8)           # 포스터 이미지 너비
 
 
+def _image_exists(image):
+    """이미지 경로가 존재하거나, 이미 열린 파일 객체(BytesIO 등)이면 True"""
+    import os
+    if hasattr(image, "read"):
+        return True
+    return os.path.exists(image)
+
+
 def _get_image_dimensions(image_path):
-    """이미지의 원본 가로/세로 비율 반환"""
+    """이미지의 원본 가로/세로 비율 반환 (경로 또는 파일 객체)"""
     try:
         from PIL import Image as PILImage
         with PILImage.open(image_path) as img:
             return img.width, img.height
     except Exception:
         return None, None
+    finally:
+        if hasattr(image_path, "seek"):
+            image_path.seek(0)
 
 
 def _calc_constrained_size(image_path, max_width, max_height=None):
@@ -413,10 +470,17 @@ def _calc_constrained_size(image_path, max_width, max_height=None):
     return result_width
 
 
+def _add_picture(run, image, width=None):
+    """run.add_picture + 이미지 삽입 단계 시간 기록
+    (같은 내용의 이미지는 python-docx가 이미지 파트 하나로 공유)"""
+    name = os.path.basename(image) if isinstance(image, str) else "(메모리 이미지)"
+    with profiling.stage(name, "image"):
+        return run.add_picture(image, width=width)
+
+
 def add_image(doc, image_path, width=None, caption=None, is_chart=False):
-    """이미지 추가 (가운데 정렬, 크기 자동 조절)"""
-    import os
-    if not os.path.exists(image_path):
+    """이미지 추가 (가운데 정렬, 크기 자동 조절). image_path는 경로 또는 BytesIO 등 파일 객체."""
+    if not _image_exists(image_path):
         return doc.add_paragraph()
 
     if width is None:
@@ -434,7 +498,7 @@ def add_image(doc, image_path, width=None, caption=None, is_chart=False):
     para.paragraph_format.space_before = Pt(4)
     para.paragraph_format.space_after = Pt(4)
     run = para.add_run()
-    run.add_picture(image_path, width=width)
+    _add_picture(run, image_path, width=width)
 
     if caption:
         cap = doc.add_paragraph()
@@ -448,8 +512,7 @@ def add_image(doc, image_path, width=None, caption=None, is_chart=False):
 def add_images_auto(doc, image_paths):
     """이미지 자동 배치: 1개면 중앙 단독, 2개 이상이면 2열 그리드.
     홀수 개일 경우 마지막 이미지는 중앙에 단독 배치."""
-    import os
-    valid = [p for p in image_paths if os.path.exists(p)]
+    valid = [p for p in image_paths if _image_exists(p)]
     if not valid:
         return None
 
@@ -473,7 +536,6 @@ def add_images_auto(doc, image_paths):
 
 def _add_images_grid(doc, image_paths, img_width):
     """2열 이미지 그리드 (테두리 없는 표, 간격 최소화)"""
-    import os
     cols = 2
     rows_needed = (len(image_paths) + cols - 1) // cols
     table = doc.add_table(rows=rows_needed, cols=cols)
@@ -485,7 +547,7 @@ def _add_images_grid(doc, image_paths, img_width):
     _set_table_cell_margins(table, top=0, bottom=0, start=28, end=28)
 
     for idx, img_path in enumerate(image_paths):
-        if not os.path.exists(img_path):
+        if not _image_exists(img_path):
             continue
         row_idx = idx // cols
         col_idx = idx % cols
@@ -496,7 +558,7 @@ def _add_images_grid(doc, image_paths, img_width):
         para.paragraph_format.space_after = Pt(1)
         try:
             run = para.add_run()
-            run.add_picture(img_path, width=img_width)
+            _add_picture(run, img_path, width=img_width)
         except Exception:
             run = para.add_run("[이미지]")
             set_run_font(run, size=Fonts.CAPTION, color=Colors.LIGHT_GRAY)
@@ -1,6 +1,6 @@
 """탭 4: 예산/관객"""
 
-import os
+import io
 import streamlit as st
 from utils import add_item, remove_item, parse_amount
 from chart_generator import create_visitor_pie_chart, create_weekly_visitors_chart, create_budget_comparison_chart
@@ -117,9 +117,9 @@ def render(tab):
                     _chart_planned.append(_p)
                     _chart_actual.append(_a)
         if _chart_cats:
-            _chart_path = create_budget_comparison_chart(_chart_cats, _chart_planned, _chart_actual)
-            st.image(_chart_path, width=500)
-            os.remove(_chart_path)
+            _chart = create_budget_comparison_chart(_chart_cats, _chart_planned, _chart_actual,
+                                                    output_path=io.BytesIO())
+            st.image(_chart, width=500)
 
         st.markdown("**상세 예산 집행 내역**")
         for i, item in enumerate(st.session_state.budget_details):
@@ -289,9 +289,9 @@ def render(tab):
             ticket_data["기타 할인"] = st.session_state.visitor_discount
 
         if ticket_data:
-            chart_path = create_visitor_pie_chart(ticket_data, title="입장권별 관객 구성")
-            st.image(chart_path, width=400)
-            os.remove(chart_path)
+            chart = create_visitor_pie_chart(ticket_data, title="입장권별 관객 구성",
+                                             output_path=io.BytesIO())
+            st.image(chart, width=400)
 
         st.markdown("**관객 분석 불릿** (굵은 텍스트, → 화살표, - 하위 불릿 혼합)")
         st.info("● 일반 텍스트 → '→'로 시작하면 파란 화살표 → '-'로 시작하면 하위 불릿")
@@ -357,9 +357,9 @@ def render(tab):
 
         # 주별 바 차트 미리보기
         if st.session_state.weekly_visitors:
-            chart_path = create_weekly_visitors_chart(st.session_state.weekly_visitors)
-            st.image(chart_path, width=600)
-            os.remove(chart_path)
+            chart = create_weekly_visitors_chart(st.session_state.weekly_visitors,
+                                                 output_path=io.BytesIO())
+            st.image(chart, width=600)
 
         st.session_state.visitor_analysis = st.text_area(
             "관객 분석 코멘트",
@@ -1,11 +1,15 @@
 """탭 7: 분석 인사이트"""
 
+import io
 import os
 import streamlit as st
 import reference_data as rd
+import reference_store as rs
 import analysis_engine as ae
 from utils import collect_current_for_analysis
 
+_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
 
 def render(tab, load_reference_data):
     with tab:
@@ -16,9 +20,12 @@ def render(tab, load_reference_data):
         if ref_df is None:
             st.warning("⚠️ 레퍼런스 데이터 파일을 찾을 수 없습니다. `exhibition_reference_data.xlsx` 파일을 앱 폴더에 넣어주세요.")
         else:
+            # 유형별 분할·전시 수는 레퍼런스 버전당 한 번만 계산 (rerun마다 재계산하지 않음)
+            partition = rd.get_type_partition(ref_df)
+
             # 유형 0(특수 전시) 제외한 분석 대상 수
-            analysis_count = len(rd.exclude_type_zero(ref_df))
-            excluded_count = len(ref_df) - analysis_count
+            analysis_count = len(partition.all)
+            excluded_count = partition.excluded_count
             info_text = f"📊 레퍼런스: {analysis_count}개 과거 전시 데이터 기반 비교 분석"
             if excluded_count > 0:
                 info_text += f" (유형 0으로 분류된 {excluded_count}개 특수 전시 제외)"
@@ -29,8 +36,8 @@ def render(tab, load_reference_data):
             has_type_data = type_col in ref_df.columns and ref_df[type_col].notna().any()
 
             if has_type_data:
-                valid_types = sorted([t for t in ref_df[type_col].dropna().unique() if int(t) != 0])
-                type_options = ["전체 (유형 0 제외)"] + [f"{int(t)}유형 ({rd.get_type_count(ref_df, t)}개 전시)" for t in valid_types]
+                valid_types = partition.valid_types
+                type_options = ["전체 (유형 0 제외)"] + [f"{int(t)}유형 ({partition.count(t)}개 전시)" for t in valid_types]
                 selected_type_idx = st.selectbox(
                     "비교 대상 전시 유형",
                     range(len(type_options)),
@@ -52,7 +59,7 @@ def render(tab, load_reference_data):
                 if not has_data:
                     st.warning("분석할 데이터가 부족합니다. 예산, 관객, 프로그램 등의 정보를 먼저 입력해주세요.")
                 else:
-                    result = ae.generate_all_insights(current, ref_df, exhibition_type=exhibition_type)
+                    result = ae.generate_all_insights_cached(current, ref_df, exhibition_type=exhibition_type)
                     st.session_state["analysis_result"] = result
                     st.session_state["analysis_current"] = current
 
@@ -122,6 +129,13 @@ def render(tab, load_reference_data):
                         display_df = result.similar_comparison_table.copy()
                         st.dataframe(display_df, use_container_width=True, hide_index=True)
 
+                    # ── 기간별 비교표 ──
+                    if result.period_comparison_table is not None:
+                        st.divider()
+                        st.subheader("📅 기간별 비교")
+                        st.markdown("역대 전체와 최근 전시(시작 연도 기준)의 평균·백분위를 함께 비교합니다.")
+                        st.dataframe(result.period_comparison_table, use_container_width=True, hide_index=True)
+
                     # ── 레퍼런스 갱신 ──
                     st.divider()
                     st.subheader("📥 레퍼런스 갱신")
@@ -130,18 +144,14 @@ def render(tab, load_reference_data):
                     if st.button("➕ 이번 전시를 레퍼런스에 추가", use_container_width=True):
                         if "analysis_current" in st.session_state:
                             try:
-                                ref_path = os.path.join(
-                                    os.path.dirname(os.path.abspath(__file__)),
-                                    "..", "exhibition_reference_data.xlsx"
-                                )
-                                if not os.path.exists(ref_path):
-                                    ref_path = os.path.join(
-                                        os.path.dirname(os.path.abspath(__file__)),
-                                        "..", "..", "exhibition_reference_data.xlsx"
-                                    )
+                                # 분석에 쓴 것과 같은 원본에 추가 — 저장소면 한 행만 추가
+                                ref_path, xlsx_path = rs.resolve_reference_source(_APP_DIR)
+                                if ref_path is None:
+                                    raise FileNotFoundError(rs.REFERENCE_XLSX_NAME)
                                 rd.add_exhibition_to_reference(
                                     ref_path,
-                                    st.session_state["analysis_current"]
+                                    st.session_state["analysis_current"],
+                                    source_xlsx=xlsx_path,
                                 )
                                 st.success(f"✅ 《{st.session_state.exhibition_title}》 데이터가 레퍼런스에 추가되었습니다!")
                                 load_reference_data.clear()
@@ -149,3 +159,25 @@ def render(tab, load_reference_data):
                                 st.error(f"❌ 레퍼런스 갱신 실패: {str(e)}")
                         else:
                             st.warning("먼저 '분석 실행'을 눌러주세요.")
+
+                    if st.button("📤 레퍼런스 Excel 내보내기", use_container_width=True):
+                        try:
+                            ref_path, xlsx_path = rs.resolve_reference_source(_APP_DIR)
+                            if ref_path is None:
+                                raise FileNotFoundError(rs.REFERENCE_XLSX_NAME)
+                            if rs.is_store_path(ref_path):
+                                buf = io.BytesIO()
+                                rs.open_store(ref_path, xlsx_path).export_xlsx(buf)
+                                data = buf.getvalue()
+                            else:
+                                with open(ref_path, "rb") as f:
+                                    data = f.read()
+                            st.download_button(
+                                label="⬇️ 레퍼런스 Excel 다운로드",
+                                data=data,
+                                file_name=rs.REFERENCE_XLSX_NAME,
+                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                use_container_width=True,
+                            )
+                        except Exception as e:
+                            st.error(f"❌ 내보내기 실패: {str(e)}")
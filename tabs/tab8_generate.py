@@ -1,12 +1,11 @@
 """탭 8: 보고서 생성"""
 
-import os
 import json
-import tempfile
 import streamlit as st
 import analysis_engine as ae
+import profiling
 from report_generator import generate_report
-from utils import collect_data
+from utils import collect_data, get_session_workspace
 
 
 def _load_json_to_session(loaded):
@@ -160,6 +159,22 @@ def _load_json_to_session(loaded):
         st.session_state.staff_volunteers_role = staff["volunteers"].get("role", "")
 
 
+def _render_profile(profile):
+    """보고서 생성 단계별 소요 시간 표시"""
+    with st.expander(f"⏱️ 생성 소요 시간: {profile.total_seconds:.2f}초", expanded=True):
+        cols = st.columns(len(profile.by_category()) or 1)
+        for col, (cat, (count, seconds)) in zip(cols, profile.by_category().items()):
+            col.metric(f"{profiling.CATEGORY_LABELS.get(cat, cat)} ({count}건)", f"{seconds:.2f}초")
+        st.dataframe(
+            [{"단계": s.name, "분류": profiling.CATEGORY_LABELS.get(s.category, s.category),
+              "소요 시간(초)": round(s.seconds, 3), "비고": s.detail}
+             for s in profile.stages],
+            use_container_width=True, hide_index=True,
+        )
+        if profile.cprofile_stats:
+            st.code(profile.cprofile_stats, language="text")
+
+
 def render(tab):
     with tab:
         st.markdown('<div class="section-header">보고서 생성</div>', unsafe_allow_html=True)
@@ -209,6 +224,14 @@ def render(tab):
         if not st.session_state.exhibition_title:
             st.warning("⚠️ 전시 제목은 필수 항목입니다. '기본 정보' 탭에서 입력해주세요.")
 
+        col_opt1, col_opt2 = st.columns(2)
+        with col_opt1:
+            show_profile = st.checkbox("⏱️ 생성 단계별 소요 시간 표시", key="show_generation_profile")
+        with col_opt2:
+            use_cprofile = st.checkbox("🔬 cProfile 상세 측정", key="use_generation_cprofile",
+                                       disabled=not show_profile,
+                                       help="함수별 누적 시간을 수집합니다. 생성이 다소 느려집니다.")
+
         col_btn1, col_btn2 = st.columns(2)
 
         with col_btn1:
@@ -216,44 +239,51 @@ def render(tab):
                           use_container_width=True):
                 with st.spinner("보고서를 생성하고 있습니다..."):
                     try:
-                        data = collect_data()
-
-                        # 선택된 인사이트 수집
-                        selected_insights = []
-                        if "analysis_result" in st.session_state:
-                            ar = st.session_state["analysis_result"]
-                            grouped = ae.get_insights_by_category(ar)
-                            for cat in ae.CATEGORY_ORDER:
-                                if cat not in grouped:
-                                    continue
-                                for i, ins in enumerate(grouped[cat]):
-                                    key = f"ins_{cat}_{i}"
-                                    if st.session_state.get("insight_selections", {}).get(key, ins.priority <= 2):
-                                        edited_text = st.session_state.get("insight_texts", {}).get(key, ins.text)
-                                        selected_insights.append({
-                                            "category": cat,
-                                            "category_label": ae.CATEGORY_LABELS.get(cat, cat),
-                                            "title": ins.title,
-                                            "text": edited_text,
-                                        })
-                                if ar.similar_comparison_table is not None:
-                                    data["similar_comparison_table"] = ar.similar_comparison_table.values.tolist()
-                                    data["similar_comparison_headers"] = ar.similar_comparison_table.columns.tolist()
-
-                        data["analysis_insights"] = selected_insights
-
-                        output_path = os.path.join(tempfile.gettempdir(), f"전시보고서_{st.session_state.exhibition_title}.docx")
-                        generate_report(data, output_path)
-
-                        with open(output_path, "rb") as f:
-                            st.download_button(
-                                label="⬇️ Word 파일 다운로드",
-                                data=f.read(),
-                                file_name=f"전시보고서 - 《{st.session_state.exhibition_title}》.docx",
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                use_container_width=True
+                        # 수집 → 생성 → 다운로드 동안 작업 공간이 정리되지 않도록 사용 중 표시
+                        workspace = get_session_workspace()
+                        with workspace.use():
+                            data = collect_data(workspace)
+
+                            # 선택된 인사이트 수집
+                            selected_insights = []
+                            if "analysis_result" in st.session_state:
+                                ar = st.session_state["analysis_result"]
+                                grouped = ae.get_insights_by_category(ar)
+                                for cat in ae.CATEGORY_ORDER:
+                                    if cat not in grouped:
+                                        continue
+                                    for i, ins in enumerate(grouped[cat]):
+                                        key = f"ins_{cat}_{i}"
+                                        if st.session_state.get("insight_selections", {}).get(key, ins.priority <= 2):
+                                            edited_text = st.session_state.get("insight_texts", {}).get(key, ins.text)
+                                            selected_insights.append({
+                                                "category": cat,
+                                                "category_label": ae.CATEGORY_LABELS.get(cat, cat),
+                                                "title": ins.title,
+                                                "text": edited_text,
+                                            })
+                                    if ar.similar_comparison_table is not None:
+                                        data["similar_comparison_table"] = ar.similar_comparison_table.values.tolist()
+                                        data["similar_comparison_headers"] = ar.similar_comparison_table.columns.tolist()
+
+                            data["analysis_insights"] = selected_insights
+
+                            # 임시 파일 없이 메모리에서 바로 다운로드
+                            docx_bytes, profile = generate_report(
+                                data, with_profile=True, cprofile=show_profile and use_cprofile
                             )
+
+                        st.download_button(
+                            label="⬇️ Word 파일 다운로드",
+                            data=docx_bytes,
+                            file_name=f"전시보고서 - 《{st.session_state.exhibition_title}》.docx",
+                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                            use_container_width=True
+                        )
                         st.success("✅ Word 보고서가 생성되었습니다!")
+
+                        if show_profile:
+                            _render_profile(profile)
                     except Exception as e:
                         st.error(f"❌ 보고서 생성 중 오류가 발생했습니다: {str(e)}")
 
@@ -269,7 +299,10 @@ def render(tab):
 
         with col_save1:
             if st.button("💾 입력 데이터 저장 (JSON)", use_container_width=True):
-                data = collect_data()
+                # 업로드 파일을 읽는 동안 작업 공간이 정리되지 않도록 사용 중 표시
+                workspace = get_session_workspace()
+                with workspace.use():
+                    data = collect_data(workspace)
                 # 이미지 경로 제거 (JSON에 저장 불가)
                 for room in data.get("rooms", []):
                     room.pop("floor_plan", None)
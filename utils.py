@@ -2,12 +2,14 @@
 공통 헬퍼 함수
 """
 
-import os
-import tempfile
+import hashlib
 import json
+import os
 import streamlit as st
 from datetime import date
 
+from workspace import get_workspace_manager, new_session_id
+
 
 def add_item(key, template):
     """리스트에 새 항목 추가"""
@@ -45,19 +47,58 @@ def parse_num(s):
         return None
 
 
-def save_uploaded_images_to_temp(uploaded_files, prefix="img"):
-    """업로드된 파일을 임시 경로에 저장하고 경로 리스트 반환"""
+def get_session_workspace():
+    """현재 Streamlit 세션 전용 임시 작업 공간 (다른 세션과 파일이 섞이지 않음)"""
+    if "_workspace_id" not in st.session_state:
+        st.session_state["_workspace_id"] = new_session_id()
+    return get_workspace_manager().get(st.session_state["_workspace_id"])
+
+
+def save_uploaded_images_to_temp(uploaded_files, prefix="img", workspace=None):
+    """업로드된 파일을 세션 작업 공간에 저장하고 경로 리스트 반환"""
+    workspace = workspace or get_session_workspace()
     paths = []
     if uploaded_files:
         for i, f in enumerate(uploaded_files):
-            path = os.path.join(tempfile.gettempdir(), f"{prefix}_{i}.png")
-            with open(path, "wb") as out:
-                out.write(f.getvalue())
-            paths.append(path)
+            paths.append(workspace.write_bytes(f"{prefix}_{i}.png", f.getvalue()))
     return paths
 
 
-def collect_data():
+def _upload_identity(uploaded):
+    """업로드 파일의 식별자 — Streamlit file_id, 없으면 내용 해시"""
+    file_id = getattr(uploaded, "file_id", None)
+    if file_id:
+        return f"id:{file_id}"
+    return f"sha1:{hashlib.sha1(uploaded.getvalue()).hexdigest()}"
+
+
+def _materialize_upload(workspace, name, uploaded, manifest, seen):
+    """
+    업로드 파일을 작업 공간에 저장하고 경로를 반환합니다.
+    같은 경로에 같은 업로드가 이미 저장되어 있으면 다시 쓰지 않습니다.
+
+    manifest: 세션에 보관하는 {경로: 업로드 식별자}
+    seen: 이번 수집에서 사용한 경로 (정리 대상 판별용)
+    """
+    path = workspace.file_path(name)
+    identity = _upload_identity(uploaded)
+    seen.add(path)
+    if manifest.get(path) == identity and os.path.exists(path):
+        return path
+    workspace.write_bytes(name, uploaded.getvalue())
+    manifest[path] = identity
+    return path
+
+
+def _prune_uploads(workspace, manifest, seen):
+    """이번 수집에서 쓰이지 않은 (삭제·교체된) 업로드 파일 정리"""
+    for path in [p for p in manifest if p not in seen]:
+        del manifest[path]
+        if os.path.dirname(path) == workspace.path:
+            workspace.remove_file(os.path.basename(path))
+
+
+def collect_data(workspace=None):
     """폼 데이터를 report_generator v2에 맞는 구조로 변환"""
 
     # 전시 기간 포맷
@@ -136,12 +177,15 @@ def collect_data():
         }
 
     # 포스터 이미지
+    # 업로드 이미지는 바뀐 것만 작업 공간에 다시 씀
+    workspace = workspace or get_session_workspace()
+    manifest = st.session_state.setdefault("_materialized_uploads", {})
+    seen = set()
+
     poster_path = None
     poster_file = st.session_state.get("poster_file")
     if poster_file:
-        poster_path = os.path.join(tempfile.gettempdir(), "poster_image.png")
-        with open(poster_path, "wb") as f:
-            f.write(poster_file.getvalue())
+        poster_path = _materialize_upload(workspace, "poster_image.png", poster_file, manifest, seen)
 
     data = {
         "exhibition_title": st.session_state.exhibition_title,
@@ -239,7 +283,8 @@ def collect_data():
     data["visitor_composition"]["visitor_type"] = vtype_data
 
     # 전시실 데이터 (이미지 처리)
-    for room in st.session_state.rooms:
+    # 같은 이름의 전시실이 있어도 겹치지 않도록 파일 이름에 순번 포함
+    for i, room in enumerate(st.session_state.rooms):
         room_data = {
             "name": room.get("name", ""),
             "artists": room.get("artists", ""),
@@ -248,23 +293,20 @@ def collect_data():
         # 도면 이미지 저장
         floor_plan_file = room.get("floor_plan_file")
         if floor_plan_file:
-            fp_path = os.path.join(tempfile.gettempdir(), f"floor_{room.get('name', 'room')}.png")
-            with open(fp_path, "wb") as f:
-                f.write(floor_plan_file.getvalue())
-            room_data["floor_plan"] = fp_path
+            room_data["floor_plan"] = _materialize_upload(
+                workspace, f"floor_{i}_{room.get('name', 'room')}.png", floor_plan_file, manifest, seen)
 
         # 전경 사진 저장
         photo_files = room.get("photo_files", [])
         photo_paths = []
         for j, photo in enumerate(photo_files):
-            p_path = os.path.join(tempfile.gettempdir(), f"photo_{room.get('name', 'room')}_{j}.png")
-            with open(p_path, "wb") as f:
-                f.write(photo.getvalue())
-            photo_paths.append(p_path)
+            photo_paths.append(_materialize_upload(
+                workspace, f"photo_{i}_{room.get('name', 'room')}_{j}.png", photo, manifest, seen))
         room_data["photos"] = photo_paths
 
         data["rooms"].append(room_data)
 
+    _prune_uploads(workspace, manifest, seen)
     return data
 
 
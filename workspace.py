@@ -0,0 +1,248 @@
+"""
+세션별 임시 작업 공간
+- Streamlit 세션마다 고유한 임시 디렉토리 (다른 사용자와 파일 이름 충돌 없음)
+- 사용 중 참조 카운트: 보고서 생성 중에는 정리(sweep)되지 않음
+- 세션당 용량 상한
+- 일정 시간 사용되지 않은 디렉토리는 주기적으로 정리
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+# ──────────────────────────────────────────────
+# 설정
+# ──────────────────────────────────────────────
+
+WORKSPACE_ROOT = os.path.join(tempfile.gettempdir(), "exhibition_report_sessions")
+WORKSPACE_QUOTA_BYTES = 500 * 1024 * 1024   # 세션당 최대 용량
+WORKSPACE_MAX_IDLE_SECONDS = 6 * 60 * 60    # 이 시간 동안 쓰지 않은 작업 공간은 정리
+SWEEP_INTERVAL_SECONDS = 10 * 60            # 정리 주기
+
+
+class WorkspaceQuotaExceeded(Exception):
+    """세션 작업 공간 용량 초과"""
+
+
+def _safe_filename(name):
+    """경로 구분자 등 파일 이름에 쓸 수 없는 문자를 '_'로 치환"""
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", str(name)).strip(" .")
+    return name or "file"
+
+
+# ──────────────────────────────────────────────
+# 작업 공간
+# ──────────────────────────────────────────────
+
+class SessionWorkspace:
+    """세션 하나의 임시 디렉토리"""
+
+    def __init__(self, session_id, root=WORKSPACE_ROOT, quota_bytes=WORKSPACE_QUOTA_BYTES):
+        self.session_id = session_id
+        self.quota_bytes = quota_bytes
+        os.makedirs(root, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=f"{_safe_filename(session_id)[:32]}_", dir=root)
+        self._sizes = {}  # 파일 경로 → 크기 (용량 계산용)
+        self._refcount = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self.touch()
+
+    # ── 사용 표시 ──
+
+    def touch(self):
+        """마지막 사용 시각 갱신 (정리 기준)"""
+        self.last_used = time.time()
+        try:
+            os.utime(self.path)
+        except OSError:
+            pass
+
+    @property
+    def in_use(self):
+        return self._refcount > 0
+
+    def acquire(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("이미 정리된 작업 공간입니다.")
+            self._refcount += 1
+        self.touch()
+        return self
+
+    def release(self):
+        with self._lock:
+            self._refcount = max(0, self._refcount - 1)
+            remove = self._closed and self._refcount == 0
+        if remove:
+            self._remove()
+
+    @contextmanager
+    def use(self):
+        """with 블록 동안 정리되지 않도록 참조 카운트 유지"""
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def close(self):
+        """작업 공간 삭제 (사용 중이면 마지막 release 때 삭제)"""
+        with self._lock:
+            self._closed = True
+            remove = self._refcount == 0
+        if remove:
+            self._remove()
+
+    def close_if_idle(self, max_idle_seconds, now=None):
+        """
+        사용 중이 아니고 max_idle_seconds 이상 쓰지 않았으면 삭제.
+        acquire와 같은 잠금 안에서 판단하므로 판단과 삭제 사이에 사용이 시작될 수 없습니다.
+
+        Returns:
+            삭제했으면 True
+        """
+        now = now or time.time()
+        with self._lock:
+            if self._closed or self._refcount > 0 or now - self.last_used <= max_idle_seconds:
+                return False
+            self._closed = True
+        self._remove()
+        return True
+
+    def _remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._sizes.clear()
+
+    # ── 파일 ──
+
+    @property
+    def used_bytes(self):
+        return sum(self._sizes.values())
+
+    def file_path(self, name):
+        """작업 공간 안의 안전한 파일 경로"""
+        return os.path.join(self.path, _safe_filename(name))
+
+    def write_bytes(self, name, data):
+        """파일 저장 후 경로 반환. 용량 상한을 넘으면 WorkspaceQuotaExceeded."""
+        path = self.file_path(name)
+        with self._lock:
+            projected = self.used_bytes - self._sizes.get(path, 0) + len(data)
+            if projected > self.quota_bytes:
+                raise WorkspaceQuotaExceeded(
+                    f"작업 공간 용량 초과: {projected / 1024 / 1024:.1f}MB "
+                    f"(상한 {self.quota_bytes / 1024 / 1024:.0f}MB)"
+                )
+            self._sizes[path] = len(data)
+        with open(path, "wb") as f:
+            f.write(data)
+        self.touch()
+        return path
+
+    def remove_file(self, name):
+        path = self.file_path(name)
+        with self._lock:
+            self._sizes.pop(path, None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# ──────────────────────────────────────────────
+# 관리자
+# ──────────────────────────────────────────────
+
+class WorkspaceManager:
+    """세션 ID → 작업 공간. 오래된 작업 공간은 주기적으로 정리합니다."""
+
+    def __init__(self, root=WORKSPACE_ROOT, quota_bytes=WORKSPACE_QUOTA_BYTES,
+                 max_idle_seconds=WORKSPACE_MAX_IDLE_SECONDS,
+                 sweep_interval=SWEEP_INTERVAL_SECONDS):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.max_idle_seconds = max_idle_seconds
+        self.sweep_interval = sweep_interval
+        self._workspaces = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def get(self, session_id):
+        """세션의 작업 공간 (없거나 이미 정리됐으면 새로 생성)"""
+        self.maybe_sweep()
+        with self._lock:
+            ws = self._workspaces.get(session_id)
+            if ws is None or ws._closed or not os.path.isdir(ws.path):
+                ws = SessionWorkspace(session_id, root=self.root, quota_bytes=self.quota_bytes)
+                self._workspaces[session_id] = ws
+            # sweep도 이 잠금 안에서 판단하므로, 돌려준 작업 공간은 곧바로 정리되지 않음
+            ws.touch()
+        return ws
+
+    def close(self, session_id):
+        with self._lock:
+            ws = self._workspaces.pop(session_id, None)
+        if ws is not None:
+            ws.close()
+
+    def maybe_sweep(self):
+        """마지막 정리 후 sweep_interval이 지났으면 정리"""
+        now = time.time()
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            self.sweep(now)
+
+    def sweep(self, now=None):
+        """
+        max_idle_seconds 이상 쓰지 않은 작업 공간을 삭제합니다.
+        사용 중(참조 카운트 > 0)인 작업 공간은 건너뛰며,
+        이 프로세스가 모르는 디렉토리(재시작 전 세션 등)는 수정 시각으로 판단합니다.
+
+        Returns:
+            삭제한 디렉토리 수
+        """
+        now = now or time.time()
+        removed = 0
+
+        with self._lock:
+            known = {ws.path: (sid, ws) for sid, ws in self._workspaces.items()}
+            for path, (sid, ws) in known.items():
+                if ws.close_if_idle(self.max_idle_seconds, now):
+                    del self._workspaces[sid]
+                    removed += 1
+
+        try:
+            entries = os.listdir(self.root)
+        except OSError:
+            return removed
+        for name in entries:
+            path = os.path.join(self.root, name)
+            if path in known or not os.path.isdir(path):
+                continue
+            try:
+                idle = now - os.path.getmtime(path)
+            except OSError:
+                continue
+            if idle > self.max_idle_seconds:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+_manager = WorkspaceManager()
+
+
+def get_workspace_manager():
+    """프로세스 전역 작업 공간 관리자"""
+    return _manager
+
+
+def new_session_id():
+    return uuid.uuid4().hex